@@ -0,0 +1,37 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+from .routers import is_pinned, pin_to_primary, reset_pinning
+
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.QUERY_POOL_WORKERS,
+    thread_name_prefix='query',
+)
+
+
+def _run(func, pinned):
+    close_old_connections()
+    reset_pinning()
+    if pinned:
+        pin_to_primary()
+    try:
+        return func()
+    finally:
+        reset_pinning()
+
+
+def run_concurrently(*funcs):
+    """Выполняет независимые запросы к БД параллельно в пуле потоков.
+
+    Каждая функция должна вернуть уже вычисленный результат, а не
+    ленивый QuerySet. Внутри транзакции потоки не видят её данных,
+    поэтому там функции выполняются последовательно.
+    """
+    if not settings.CONCURRENT_QUERIES or connection.in_atomic_block:
+        return [func() for func in funcs]
+    pinned = is_pinned()
+    futures = [_executor.submit(_run, func, pinned) for func in funcs]
+    return [future.result() for future in futures]
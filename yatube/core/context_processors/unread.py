@@ -0,0 +1,16 @@
+from django.utils.functional import SimpleLazyObject
+
+from posts.unread import unread_count
+
+
+def unread(request):
+    """Счётчик непрочитанных записей ленты; читается, только если
+    шаблон к нему обращается.
+    """
+    if not request.user.is_authenticated:
+        return {}
+    return {
+        'unread_count': SimpleLazyObject(
+            lambda: unread_count(request.user.id)
+        ),
+    }
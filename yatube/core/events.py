@@ -0,0 +1,145 @@
+import json
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    def __init__(self, bus, channel):
+        self.bus = bus
+        self.channel = channel
+        self.queue = queue.Queue(settings.EVENTS_QUEUE_SIZE)
+
+    def __enter__(self):
+        self.bus.add(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.bus.remove(self)
+
+    def get(self, timeout):
+        """Следующее событие или None, если за timeout ничего не пришло."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class InProcessBus:
+    """Pub/sub внутри процесса: у каждого подписчика своя ограниченная
+    очередь. Медленный подписчик теряет события, а не тормозит
+    публикацию.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def subscribe(self, channel):
+        return Subscription(self, channel)
+
+    def add(self, subscription):
+        with self._lock:
+            self._subscriptions[subscription.channel].add(subscription)
+
+    def remove(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions[subscription.channel]
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.channel]
+
+    def publish(self, channel, data):
+        self.deliver(channel, data)
+
+    def deliver(self, channel, data):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.queue.put_nowait(data)
+            except queue.Full:
+                logger.warning('Event dropped for slow subscriber: %s',
+                               channel)
+
+
+class RedisBus(InProcessBus):
+    """Общая шина для нескольких процессов через Redis pub/sub.
+
+    Процесс держит одно подключение-слушатель и раздаёт пришедшие
+    события своим подписчикам так же, как InProcessBus.
+    """
+
+    prefix = 'yatube:events:'
+
+    def __init__(self, url):
+        super().__init__()
+        self.client = redis.Redis.from_url(url)
+        self._listener = threading.Thread(target=self.listen, daemon=True)
+        self._listener.start()
+
+    def publish(self, channel, data):
+        self.client.publish(self.prefix + channel, json.dumps(data))
+
+    def listen(self):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(self.prefix + '*')
+        for message in pubsub.listen():
+            channel = message['channel'].decode()[len(self.prefix):]
+            self.deliver(channel, json.loads(message['data']))
+
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_bus():
+    """Шина событий процесса: Redis при EVENTS_REDIS_URL, если пакет
+    redis установлен, иначе InProcessBus.
+    """
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            url = settings.EVENTS_REDIS_URL
+            if url and redis is not None:
+                _bus = RedisBus(url)
+            else:
+                if url:
+                    logger.warning('redis is not installed, '
+                                   'using in-process event bus')
+                _bus = InProcessBus()
+        return _bus
+
+
+def publish(channel, data):
+    get_bus().publish(channel, data)
+
+
+def event_stream(channel, event):
+    """Генератор text/event-stream для StreamingHttpResponse.
+
+    Комментарий-пинг раз в EVENTS_KEEPALIVE секунд держит соединение
+    открытым; через EVENTS_MAX_DURATION поток закрывается, и браузер
+    переподключается сам.
+    """
+    deadline = time.monotonic() + settings.EVENTS_MAX_DURATION
+    with get_bus().subscribe(channel) as subscription:
+        yield 'retry: 3000\n\n'
+        while time.monotonic() < deadline:
+            data = subscription.get(timeout=settings.EVENTS_KEEPALIVE)
+            if data is None:
+                yield ': keepalive\n\n'
+            else:
+                yield f'event: {event}\ndata: {json.dumps(data)}\n\n'
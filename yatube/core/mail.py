@@ -0,0 +1,101 @@
+import logging
+import pickle
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils import timezone
+
+from .models import QueuedEmail
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Сохраняет письма в таблицу QueuedEmail и сразу возвращает
+    управление; доставляет их команда send_queued_mail.
+    """
+
+    def send_messages(self, email_messages):
+        queued = []
+        for message in email_messages:
+            if not message.recipients():
+                continue
+            message.connection = None
+            queued.append(QueuedEmail(message=pickle.dumps(message)))
+        QueuedEmail.objects.bulk_create(queued)
+        return len(queued)
+
+
+def retry_delay(attempts):
+    return min(
+        settings.EMAIL_QUEUE_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.EMAIL_QUEUE_MAX_RETRY_DELAY,
+    )
+
+
+def claim_batch(batch_size):
+    """Забирает пачку писем, которым пора уходить.
+
+    Письма «арендуются» сдвигом next_attempt_at на EMAIL_QUEUE_LEASE:
+    параллельный обработчик их не увидит, а после падения процесса
+    аренда истечёт и письма уйдут снова.
+    """
+    now = timezone.now()
+    ids = list(
+        QueuedEmail.objects.filter(next_attempt_at__lte=now)
+        .values_list('id', flat=True)[:batch_size]
+    )
+    lease_until = now + timedelta(seconds=settings.EMAIL_QUEUE_LEASE)
+    QueuedEmail.objects.filter(
+        id__in=ids, next_attempt_at__lte=now
+    ).update(next_attempt_at=lease_until)
+    return list(
+        QueuedEmail.objects.filter(id__in=ids, next_attempt_at=lease_until)
+    )
+
+
+def postpone(item, error):
+    item.attempts += 1
+    item.last_error = repr(error)
+    if item.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+        item.next_attempt_at = None
+        logger.error('Email #%s dropped: %r', item.id, error)
+    else:
+        item.next_attempt_at = timezone.now() + timedelta(
+            seconds=retry_delay(item.attempts)
+        )
+    item.save(update_fields=['attempts', 'last_error', 'next_attempt_at'])
+
+
+def deliver_batch(batch_size):
+    """Отправляет пачку писем через одно соединение с
+    EMAIL_QUEUE_BACKEND. Возвращает (отправлено, отложено).
+    """
+    batch = claim_batch(batch_size)
+    if not batch:
+        return 0, 0
+    connection = get_connection(settings.EMAIL_QUEUE_BACKEND)
+    try:
+        connection.open()
+    except Exception as error:
+        for item in batch:
+            postpone(item, error)
+        return 0, len(batch)
+    sent = []
+    failed = 0
+    try:
+        for item in batch:
+            try:
+                connection.send_messages([pickle.loads(item.message)])
+            except Exception as error:
+                postpone(item, error)
+                failed += 1
+            else:
+                sent.append(item.id)
+    finally:
+        connection.close()
+        QueuedEmail.objects.filter(id__in=sent).delete()
+    return len(sent), failed
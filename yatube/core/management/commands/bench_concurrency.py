@@ -0,0 +1,59 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from posts.models import Comment, Follow, Group, Post
+
+from ...concurrency import run_concurrently
+
+
+def independent_queries():
+    """Четыре запроса, которые не зависят друг от друга."""
+    return run_concurrently(
+        lambda: Post.objects.count(),
+        lambda: Comment.objects.count(),
+        lambda: Follow.objects.count(),
+        lambda: Group.objects.count(),
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает последовательное и параллельное (run_concurrently) '
+        'выполнение независимых запросов к БД.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=8)
+
+    def handle(self, *args, **options):
+        for concurrent in (False, True):
+            with override_settings(CONCURRENT_QUERIES=concurrent):
+                latencies, elapsed = self.run(options)
+            self.report(
+                'parallel' if concurrent else 'serial', latencies, elapsed
+            )
+
+    def run(self, options):
+        def fetch(_):
+            started = time.perf_counter()
+            independent_queries()
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            latencies = list(pool.map(fetch, range(options['requests'])))
+        return latencies, time.perf_counter() - started
+
+    def report(self, label, latencies, elapsed):
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        self.stdout.write(
+            f'{label:>8}: {len(latencies) / elapsed:8.1f} req/s, '
+            f'median {statistics.median(latencies) * 1000:6.1f} ms, '
+            f'p95 {p95 * 1000:6.1f} ms'
+        )
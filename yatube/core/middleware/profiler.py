@@ -0,0 +1,151 @@
+import cProfile
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = {
+    'orm': 'django.db',
+    'template': 'django.template',
+    'thumbnail': 'sorl.thumbnail',
+}
+
+
+class StackSampler:
+    """Периодически снимает стек потока запроса (формат collapsed)."""
+
+    extension = 'collapsed'
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self._thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.stacks[self._collapse(frame)] += 1
+
+    @staticmethod
+    def _collapse(frame):
+        names = []
+        while frame is not None:
+            module = frame.f_globals.get('__name__', '?')
+            names.append(f'{module}:{frame.f_code.co_name}')
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    def summary(self):
+        total = sum(self.stacks.values()) or 1
+        return {
+            name: sum(
+                count for stack, count in self.stacks.items()
+                if prefix in stack
+            ) * 100 // total
+            for name, prefix in CATEGORIES.items()
+        }
+
+    def dump(self, path):
+        with open(path, 'w') as output:
+            for stack, count in self.stacks.most_common():
+                output.write(f'{stack} {count}\n')
+
+
+class DeterministicProfiler:
+    """Обёртка над cProfile, сохраняющая результат в формате pstats."""
+
+    extension = 'prof'
+
+    def __init__(self, interval):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def summary(self):
+        return {}
+
+    def dump(self, path):
+        self.profile.dump_stats(path)
+
+
+PROFILERS = {
+    'collapsed': StackSampler,
+    'pstats': DeterministicProfiler,
+}
+
+
+class SamplingProfilerMiddleware:
+    """Профилирует долю запросов к выбранным view.
+
+    Доля задаётся в PROFILER_SAMPLE_RATES по имени view
+    ('posts:post_detail': 0.01). Заголовок PROFILER_HEADER включает
+    профилирование конкретного запроса для персонала и INTERNAL_IPS.
+    При PROFILER_ENABLED = False middleware исключается из цепочки.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILER_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rates = settings.PROFILER_SAMPLE_RATES
+        self.header = settings.PROFILER_HEADER
+        self.output_dir = settings.PROFILER_OUTPUT_DIR
+        self.profiler_class = PROFILERS[settings.PROFILER_FORMAT]
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        profiler = getattr(request, '_profiler', None)
+        if profiler is not None:
+            profiler.stop()
+            self.save(request, profiler)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.should_profile(request):
+            request._profiler = self.profiler_class(
+                settings.PROFILER_INTERVAL
+            )
+            request._profiler.start()
+
+    def should_profile(self, request):
+        if request.META.get(self.header):
+            return (
+                request.META.get('REMOTE_ADDR') in settings.INTERNAL_IPS
+                or request.user.is_staff
+            )
+        rate = self.sample_rates.get(request.resolver_match.view_name)
+        return rate is not None and random.random() < rate
+
+    def save(self, request, profiler):
+        view_name = request.resolver_match.view_name.replace(':', '.')
+        filename = '{}-{}-{}.{}'.format(
+            view_name, int(time.time() * 1000), os.getpid(),
+            profiler.extension,
+        )
+        path = os.path.join(self.output_dir, filename)
+        profiler.dump(path)
+        logger.info('Profile %s saved: %s', path, profiler.summary())
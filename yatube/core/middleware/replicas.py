@@ -0,0 +1,37 @@
+from django.conf import settings
+
+from ..routers import has_written, pin_to_primary, reset_pinning
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaPinningMiddleware:
+    """Закрепляет запросы пользователя за основной БД после записи.
+
+    Небезопасные методы сразу читают из default. После запроса, который
+    что-то записал, ставится cookie на REPLICA_PIN_SECONDS — пока она жива,
+    чтение не уходит на реплики, отстающие от основной БД.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        reset_pinning()
+        if (
+            request.method not in SAFE_METHODS
+            or settings.REPLICA_PIN_COOKIE in request.COOKIES
+        ):
+            pin_to_primary()
+        try:
+            response = self.get_response(request)
+            if has_written():
+                response.set_cookie(
+                    settings.REPLICA_PIN_COOKIE, '1',
+                    max_age=settings.REPLICA_PIN_SECONDS,
+                    httponly=True,
+                )
+        finally:
+            reset_pinning()
+        return response
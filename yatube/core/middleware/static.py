@@ -0,0 +1,87 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core.exceptions import (
+    MiddlewareNotUsed, SuspiciousFileOperation
+)
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.\w+$')
+
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class StaticFilesMiddleware:
+    """Отдаёт собранную статику прямо из WSGI-приложения.
+
+    Файлы с хешем в имени кешируются навсегда, для клиентов с поддержкой
+    br/gzip отдаётся заранее сжатая копия. FileResponse передаёт файл
+    через wsgi.file_wrapper, то есть через sendfile, если сервер умеет.
+    """
+
+    def __init__(self, get_response):
+        if not settings.STATIC_SERVE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        self.root = settings.STATIC_ROOT
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD') and (
+            request.path_info.startswith(self.prefix)
+        ):
+            response = self.serve(request, request.path_info[
+                len(self.prefix):
+            ])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        try:
+            path = safe_join(self.root, name)
+            stat = os.stat(path)
+        except (SuspiciousFileOperation, ValueError, OSError):
+            return None
+        if not os.path.isfile(path):
+            return None
+        if not was_modified_since(
+            request.META.get('HTTP_IF_MODIFIED_SINCE'),
+            stat.st_mtime, stat.st_size
+        ):
+            response = HttpResponseNotModified()
+        else:
+            encoding, served_path = self.choose_encoding(request, path)
+            content_type, _ = mimetypes.guess_type(path)
+            response = FileResponse(
+                open(served_path, 'rb'),
+                content_type=content_type or 'application/octet-stream',
+            )
+            response['Content-Length'] = os.path.getsize(served_path)
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        response['Vary'] = 'Accept-Encoding'
+        if HASHED_NAME.search(name):
+            response['Cache-Control'] = (
+                'public, max-age=31536000, immutable'
+            )
+        else:
+            response['Cache-Control'] = (
+                f'public, max-age={settings.STATIC_MAX_AGE}'
+            )
+        return response
+
+    @staticmethod
+    def choose_encoding(request, path):
+        accepted = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        for encoding, suffix in ENCODINGS:
+            if encoding in accepted and os.path.isfile(path + suffix):
+                return encoding, path + suffix
+        return None, path
@@ -0,0 +1,111 @@
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.shortcuts import render
+
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    count, period = rate.split('/')
+    return int(count), PERIODS[period]
+
+
+class TokenBucket:
+    """Token bucket поверх атомарного incr общего кеша.
+
+    В кеше хранятся момент начала отсчёта и число израсходованных
+    токенов. Доступно capacity + (now - start) * refill токенов; если
+    до запроса ведро было переполнено, начало отсчёта сдвигается, чтобы
+    простой не давал запаса сверх ёмкости.
+    """
+
+    def __init__(self, key, rate):
+        self.capacity, self.period = parse_rate(rate)
+        self.refill = self.capacity / self.period
+        self.start_key = f'ratelimit:{key}:start'
+        self.used_key = f'ratelimit:{key}:used'
+        self.cache = caches[settings.RATELIMIT_CACHE]
+
+    def consume(self):
+        """Берёт токен; возвращает 0 или число секунд до следующего."""
+        now = time.time()
+        timeout = self.period * 2
+        self.cache.add(self.start_key, now, timeout)
+        self.cache.add(self.used_key, 0, timeout)
+        try:
+            used = self.cache.incr(self.used_key)
+        except ValueError:
+            self.cache.set(self.used_key, 1, timeout)
+            used = 1
+        start = self.cache.get(self.start_key, now)
+        available = self.capacity + (now - start) * self.refill
+        if used > available:
+            self.cache.decr(self.used_key)
+            return (used - available) / self.refill
+        if available - used >= self.capacity:
+            start = now - (used - 1) / self.refill
+            self.cache.set(self.start_key, start, timeout)
+        else:
+            self.cache.touch(self.start_key, timeout)
+        self.cache.touch(self.used_key, timeout)
+        return 0
+
+    def refund(self):
+        """Возвращает токен, взятый consume()."""
+        try:
+            self.cache.decr(self.used_key)
+        except ValueError:
+            pass
+
+
+def client_buckets(scope, request):
+    """Вёдра запроса: пользователя по RATELIMITS и IP по
+    RATELIMITS_PER_IP.
+    """
+    user_rate = settings.RATELIMITS.get(scope)
+    if user_rate and request.user.is_authenticated:
+        yield TokenBucket(f'{scope}:user:{request.user.pk}', user_rate)
+    ip_rate = settings.RATELIMITS_PER_IP.get(scope)
+    if ip_rate:
+        ip = request.META.get('REMOTE_ADDR')
+        yield TokenBucket(f'{scope}:ip:{ip}', ip_rate)
+
+
+def ratelimit(scope, methods=('POST',)):
+    """Ограничивает частоту запросов к view по лимитам scope.
+
+    Токен берётся и из ведра пользователя, и из ведра его IP
+    (RATELIMITS_PER_IP[scope]): так лимит не обойти ни сменой адреса, ни
+    несколькими аккаунтами за одним адресом. Если одно из вёдер пусто,
+    уже взятые токены возвращаются, а ответ — 429 с заголовком
+    Retry-After.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method in methods:
+                taken = []
+                for bucket in client_buckets(scope, request):
+                    retry_after = bucket.consume()
+                    if retry_after:
+                        for spent in taken:
+                            spent.refund()
+                        return too_many_requests(request, retry_after)
+                    taken.append(bucket)
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def too_many_requests(request, retry_after):
+    retry_after = math.ceil(retry_after)
+    response = render(
+        request, 'core/429.html', {'retry_after': retry_after}, status=429
+    )
+    response['Retry-After'] = retry_after
+    return response
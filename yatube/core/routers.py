@@ -0,0 +1,45 @@
+import random
+import threading
+
+from django.conf import settings
+
+
+_state = threading.local()
+
+
+def pin_to_primary():
+    _state.pinned = True
+
+
+def reset_pinning():
+    _state.pinned = False
+    _state.written = False
+
+
+def is_pinned():
+    return getattr(_state, 'pinned', False)
+
+
+def has_written():
+    return getattr(_state, 'written', False)
+
+
+class PrimaryReplicaRouter:
+    """Чтение с реплик из DATABASE_REPLICAS, запись в default.
+
+    После первой записи в рамках запроса чтение тоже идёт в default,
+    чтобы пользователь сразу видел свои изменения.
+    """
+
+    def db_for_read(self, model, **hints):
+        if is_pinned() or not settings.DATABASE_REPLICAS:
+            return 'default'
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        _state.written = True
+        pin_to_primary()
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
@@ -0,0 +1,68 @@
+import threading
+import time
+
+from django.test import TransactionTestCase, override_settings
+
+from posts.models import Post, User
+
+from ..concurrency import run_concurrently
+from ..routers import PrimaryReplicaRouter, pin_to_primary, reset_pinning
+
+
+@override_settings(CONCURRENT_QUERIES=True)
+class RunConcurrentlyTests(TransactionTestCase):
+    def setUp(self):
+        reset_pinning()
+
+    def tearDown(self):
+        reset_pinning()
+
+    def test_results_in_call_order(self):
+        """Результаты идут в порядке функций, а не их завершения;
+        функции выполняются в потоках пула.
+        """
+        def slow(value, delay):
+            def func():
+                time.sleep(delay)
+                return value, threading.current_thread().name
+            return func
+
+        results = run_concurrently(slow(1, 0.05), slow(2, 0), slow(3, 0.02))
+        self.assertEqual([value for value, _ in results], [1, 2, 3])
+        for _, thread_name in results:
+            self.assertTrue(thread_name.startswith('query'))
+
+    def test_queries_in_workers(self):
+        """Потоки пула читают данные, закоммиченные основным потоком."""
+        user = User.objects.create_user(username='MikeyMouse')
+        Post.objects.create(author=user, text='Пост')
+        users, posts = run_concurrently(
+            lambda: list(User.objects.values_list('username', flat=True)),
+            lambda: Post.objects.count(),
+        )
+        self.assertEqual(users, ['MikeyMouse'])
+        self.assertEqual(posts, 1)
+
+    def test_exception_propagates(self):
+        """Исключение из функции пробрасывается вызывающему."""
+        def fail():
+            raise ValueError('boom')
+
+        with self.assertRaisesMessage(ValueError, 'boom'):
+            run_concurrently(lambda: 1, fail)
+
+    @override_settings(DATABASE_REPLICAS=['replica_1'])
+    def test_pinning_carries_into_workers(self):
+        """Закрепление за default переходит в потоки пула, а
+        незакреплённый запрос читает с реплики.
+        """
+        router = PrimaryReplicaRouter()
+
+        def read_db():
+            return router.db_for_read(Post)
+
+        self.assertEqual(run_concurrently(read_db), ['replica_1'])
+        pin_to_primary()
+        self.assertEqual(run_concurrently(read_db, read_db), ['default'] * 2)
+        reset_pinning()
+        self.assertEqual(run_concurrently(read_db), ['replica_1'])
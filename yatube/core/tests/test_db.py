@@ -0,0 +1,16 @@
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+
+from ..db import set_sqlite_pragmas
+
+
+class SQLitePragmasTests(SimpleTestCase):
+    databases = {'default'}
+
+    @override_settings(SQLITE_PRAGMAS={'cache_size': -2048})
+    def test_pragmas_applied_on_connect(self):
+        """PRAGMA из SQLITE_PRAGMAS выполняются для нового соединения."""
+        set_sqlite_pragmas(sender=None, connection=connection)
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA cache_size')
+            self.assertEqual(cursor.fetchone()[0], -2048)
@@ -0,0 +1,34 @@
+from django.test import SimpleTestCase, override_settings
+
+from core.events import InProcessBus, event_stream
+
+
+@override_settings(EVENTS_QUEUE_SIZE=2, EVENTS_KEEPALIVE=0.01)
+class InProcessBusTests(SimpleTestCase):
+    def test_publish_to_channel_subscribers(self):
+        """Событие получают только подписчики своего канала."""
+        bus = InProcessBus()
+        with bus.subscribe('a') as first, bus.subscribe('b') as second:
+            bus.publish('a', {'id': 1})
+            self.assertEqual(first.get(timeout=0.1), {'id': 1})
+            self.assertIsNone(second.get(timeout=0.01))
+        bus.publish('a', {'id': 2})
+        self.assertEqual(bus._subscriptions, {})
+
+    def test_slow_subscriber_drops_events(self):
+        """Переполненная очередь подписчика не блокирует публикацию."""
+        bus = InProcessBus()
+        with bus.subscribe('a') as subscription:
+            with self.assertLogs('core.events', 'WARNING'):
+                for number in range(3):
+                    bus.publish('a', number)
+            self.assertEqual(subscription.get(timeout=0.1), 0)
+            self.assertEqual(subscription.get(timeout=0.1), 1)
+            self.assertIsNone(subscription.get(timeout=0.01))
+
+    @override_settings(EVENTS_MAX_DURATION=0)
+    def test_stream_closes_after_max_duration(self):
+        """Поток закрывается через EVENTS_MAX_DURATION."""
+        self.assertEqual(
+            list(event_stream('a', 'post')), ['retry: 3000\n\n']
+        )
@@ -0,0 +1,140 @@
+import socket
+import socketserver
+import threading
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.mail import send_mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import QueuedEmail
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """Минимальный SMTP-сервер: принимает письма и складывает их в
+    server.messages.
+    """
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply('220 localhost')
+        for line in self.rfile:
+            command = line.decode().strip().upper()
+            if command.startswith(('EHLO', 'HELO')):
+                self.reply('250 localhost')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                data = b''.join(iter(self.rfile.readline, b'.\r\n'))
+                self.server.messages.append(data)
+                self.reply('250 OK')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                break
+            else:
+                self.reply('250 OK')
+
+
+class SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SMTPHandler)
+        self.connections = 0
+        self.messages = []
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.QueuedEmailBackend',
+    EMAIL_QUEUE_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+    EMAIL_HOST='127.0.0.1',
+    EMAIL_USE_TLS=False,
+    EMAIL_QUEUE_RETRY_DELAY=30,
+    EMAIL_QUEUE_MAX_ATTEMPTS=2,
+)
+class QueuedEmailTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.smtp = SMTPServer()
+        threading.Thread(target=cls.smtp.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.smtp.shutdown()
+        cls.smtp.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.smtp.connections = 0
+        self.smtp.messages.clear()
+
+    def send(self, count=1):
+        for number in range(count):
+            send_mail(
+                f'Письмо {number}', 'Текст', 'noreply@yatube.ru',
+                ['mikey@example.com'],
+            )
+
+    def deliver(self, port):
+        with self.settings(EMAIL_PORT=port):
+            call_command('send_queued_mail', stdout=StringIO())
+
+    def test_send_only_queues(self):
+        """Отправка письма только ставит его в очередь."""
+        self.send()
+        self.assertEqual(QueuedEmail.objects.count(), 1)
+        self.assertEqual(self.smtp.messages, [])
+
+    def test_batch_over_one_connection(self):
+        """Пачка писем уходит через одно SMTP-соединение."""
+        self.send(3)
+        self.deliver(self.smtp.server_address[1])
+        self.assertEqual(len(self.smtp.messages), 3)
+        self.assertEqual(self.smtp.connections, 1)
+        self.assertFalse(QueuedEmail.objects.exists())
+        self.assertIn(b'mikey@example.com', self.smtp.messages[0])
+
+    def test_retry_with_backoff(self):
+        """Недоступный сервер откладывает письмо, после исчерпания
+        попыток оно больше не отправляется.
+        """
+        self.send()
+        port = free_port()
+        self.deliver(port)
+        item = QueuedEmail.objects.get()
+        self.assertEqual(item.attempts, 1)
+        self.assertGreater(
+            item.next_attempt_at, timezone.now() + timedelta(seconds=20)
+        )
+        QueuedEmail.objects.update(next_attempt_at=timezone.now())
+        self.deliver(port)
+        item.refresh_from_db()
+        self.assertEqual(item.attempts, 2)
+        self.assertIsNone(item.next_attempt_at)
+        self.assertIn('ConnectionRefusedError', item.last_error)
+
+    def test_password_reset_queued(self):
+        """Письмо для сброса пароля ставится в очередь."""
+        get_user_model().objects.create_user(
+            username='MikeyMouse', email='mikey@example.com',
+            password='Password-123',
+        )
+        self.client.post(
+            reverse('users:password_reset'), {'email': 'mikey@example.com'}
+        )
+        self.assertEqual(QueuedEmail.objects.count(), 1)
+        self.deliver(self.smtp.server_address[1])
+        self.assertEqual(len(self.smtp.messages), 1)
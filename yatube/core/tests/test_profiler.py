@@ -0,0 +1,73 @@
+import os
+import pstats
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+
+from posts.models import Post, User
+
+
+TEMP_PROFILES_DIR = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(
+    PROFILER_ENABLED=True,
+    PROFILER_OUTPUT_DIR=TEMP_PROFILES_DIR,
+    PROFILER_SAMPLE_RATES={'posts:post_detail': 1.0},
+    PROFILER_INTERVAL=0.0001,
+)
+class SamplingProfilerTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='MikeyMouse')
+        cls.staff = User.objects.create_user(
+            username='Admin', is_staff=True
+        )
+        cls.post = Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_PROFILES_DIR, ignore_errors=True)
+
+    def setUp(self):
+        self.guest_client = Client(REMOTE_ADDR='10.0.0.1')
+        self.staff_client = Client(REMOTE_ADDR='10.0.0.1')
+        self.staff_client.force_login(self.staff)
+        cache.clear()
+        for name in os.listdir(TEMP_PROFILES_DIR):
+            os.remove(os.path.join(TEMP_PROFILES_DIR, name))
+
+    def test_sampled_view_is_profiled(self):
+        """Запрос к view из PROFILER_SAMPLE_RATES сохраняет профиль."""
+        self.guest_client.get(f'/posts/{self.post.id}/')
+        files = os.listdir(TEMP_PROFILES_DIR)
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0].startswith('posts.post_detail-'))
+        self.assertTrue(files[0].endswith('.collapsed'))
+
+    def test_not_sampled_view_is_skipped(self):
+        """View без доли семплирования не профилируется."""
+        self.guest_client.get('/')
+        self.assertEqual(os.listdir(TEMP_PROFILES_DIR), [])
+
+    @override_settings(PROFILER_FORMAT='pstats')
+    def test_header_for_staff(self):
+        """Заголовок включает профилирование только для персонала."""
+        self.guest_client.get('/', HTTP_X_PROFILE='1')
+        self.assertEqual(os.listdir(TEMP_PROFILES_DIR), [])
+        self.staff_client.get('/', HTTP_X_PROFILE='1')
+        files = os.listdir(TEMP_PROFILES_DIR)
+        self.assertEqual(len(files), 1)
+        stats = pstats.Stats(os.path.join(TEMP_PROFILES_DIR, files[0]))
+        self.assertTrue(stats.total_calls)
+
+    @override_settings(PROFILER_ENABLED=False)
+    def test_disabled_profiler(self):
+        """Выключенный профилировщик не создаёт файлов."""
+        self.guest_client.get(f'/posts/{self.post.id}/')
+        self.assertEqual(os.listdir(TEMP_PROFILES_DIR), [])
@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Comment, Post, User
+
+from ..ratelimit import TokenBucket
+
+
+class TokenBucketTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @mock.patch('core.ratelimit.time')
+    def test_refill(self, time_mock):
+        """Токены восстанавливаются со скоростью лимита."""
+        time_mock.time.return_value = 1000.0
+        bucket = TokenBucket('test', '2/m')
+        self.assertEqual(bucket.consume(), 0)
+        self.assertEqual(bucket.consume(), 0)
+        self.assertAlmostEqual(bucket.consume(), 30.0)
+        time_mock.time.return_value = 1030.0
+        self.assertEqual(bucket.consume(), 0)
+        self.assertGreater(bucket.consume(), 0)
+
+    @mock.patch('core.ratelimit.time')
+    def test_idle_time_capped_by_capacity(self, time_mock):
+        """Простой не даёт запаса токенов больше ёмкости ведра."""
+        time_mock.time.return_value = 1000.0
+        bucket = TokenBucket('test', '2/m')
+        bucket.consume()
+        time_mock.time.return_value = 1100.0
+        bucket.consume()
+        time_mock.time.return_value = 1110.0
+        self.assertEqual(bucket.consume(), 0)
+        self.assertGreater(bucket.consume(), 0)
+
+
+@override_settings(
+    RATELIMITS={'add_comment': '2/m'},
+    RATELIMITS_PER_IP={'add_comment': '3/m'},
+)
+class RateLimitViewTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='MikeyMouse')
+        cls.post = Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def setUp(self):
+        self.author_client = Client()
+        self.author_client.force_login(self.user)
+        self.url = reverse(
+            'posts:add_comment', kwargs={'post_id': self.post.id}
+        )
+        cache.clear()
+
+    def test_too_many_comments(self):
+        """Сверх лимита комментарии не сохраняются, ответ 429."""
+        for _ in range(2):
+            response = self.author_client.post(
+                self.url, {'text': 'Комментарий'}
+            )
+            self.assertEqual(response.status_code, 302)
+        response = self.author_client.post(self.url, {'text': 'Комментарий'})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+        self.assertTemplateUsed(response, 'core/429.html')
+        self.assertEqual(Comment.objects.count(), 2)
+
+    def test_shared_ip_limited(self):
+        """Пользователи за одним IP делят общий лимит адреса."""
+        other = User.objects.create_user(username='DonaldDuck')
+        other_client = Client()
+        other_client.force_login(other)
+        for _ in range(2):
+            self.author_client.post(self.url, {'text': 'Комментарий'})
+        response = other_client.post(self.url, {'text': 'Комментарий'})
+        self.assertEqual(response.status_code, 302)
+        response = other_client.post(self.url, {'text': 'Комментарий'})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(Comment.objects.count(), 3)
+
+    def test_user_limited_across_ips(self):
+        """Смена адреса не сбрасывает лимит пользователя."""
+        for address in ('10.0.0.1', '10.0.0.2'):
+            self.author_client.post(
+                self.url, {'text': 'Комментарий'}, REMOTE_ADDR=address
+            )
+        response = self.author_client.post(
+            self.url, {'text': 'Комментарий'}, REMOTE_ADDR='10.0.0.3'
+        )
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(Comment.objects.count(), 2)
@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+
+from ..routers import PrimaryReplicaRouter, pin_to_primary, reset_pinning
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class PrimaryReplicaRouterTests(TestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        reset_pinning()
+
+    def tearDown(self):
+        reset_pinning()
+
+    def test_reads_go_to_replicas(self):
+        """Чтение без записи уходит на одну из реплик."""
+        self.assertIn(
+            self.router.db_for_read(Post), settings.DATABASE_REPLICAS
+        )
+
+    def test_writes_go_to_primary_and_pin(self):
+        """Запись идёт в default и закрепляет последующее чтение."""
+        self.assertEqual(self.router.db_for_write(Post), 'default')
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    def test_pinned_reads_go_to_primary(self):
+        """Закреплённый запрос читает из default."""
+        pin_to_primary()
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        """Без реплик всё читается из default."""
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+
+
+class ReplicaPinningMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='MikeyMouse')
+        cls.author = User.objects.create_user(username='JohnKennedy')
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.author_client = Client()
+        self.author_client.force_login(self.user)
+        cache.clear()
+
+    def test_read_request_not_pinned(self):
+        """Запрос без записи не ставит cookie закрепления."""
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertNotIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+
+    def test_write_request_pins_user(self):
+        """Запрос с записью закрепляет пользователя за default."""
+        response = self.author_client.get(reverse(
+            'posts:profile_follow',
+            kwargs={'username': self.author.username}
+        ))
+        cookie = response.cookies[settings.REPLICA_PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], settings.REPLICA_PIN_SECONDS)
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class ReplicaRoutingTests(TestCase):
+    """Основная база и реплика — две разные базы SQLite."""
+    databases = {'default', 'replica_1'}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='MikeyMouse')
+        cls.author = User.objects.create_user(username='JohnKennedy')
+        # Пользователи уже доехали до реплики, пост — ещё нет.
+        for user in (cls.user, cls.author):
+            user.save(using='replica_1')
+        cls.post = Post.objects.create(author=cls.author, text='Новый пост')
+
+    def setUp(self):
+        # Сессия лежит в кеше: в таблице сессий реплики её ещё нет.
+        cache.clear()
+        self.guest_client = Client()
+        self.author_client = Client()
+        self.author_client.force_login(self.user)
+        reset_pinning()
+
+    def tearDown(self):
+        reset_pinning()
+
+    def test_pin_cookie_routes_next_request_to_primary(self):
+        """Cookie после записи направляет следующий запрос в default."""
+        url = reverse('posts:post_detail', kwargs={'post_id': self.post.id})
+        response = self.guest_client.get(url)
+        self.assertEqual(response.status_code, 404)
+        response = self.author_client.get(reverse(
+            'posts:profile_follow',
+            kwargs={'username': self.author.username}
+        ))
+        self.assertIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+        response = self.author_client.get(url)
+        self.assertEqual(response.status_code, 200)
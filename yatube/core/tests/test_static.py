@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test import Client, TestCase, override_settings
+
+from ..storage import compress_file
+
+
+TEMP_STATIC_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(STATIC_ROOT=TEMP_STATIC_ROOT, STATIC_SERVE=True)
+class StaticFilesMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(os.path.join(TEMP_STATIC_ROOT, 'css'))
+        cls.content = b'body { color: red; }\n' * 100
+        for name in ('app.css', 'app.0123456789ab.css'):
+            path = os.path.join(TEMP_STATIC_ROOT, 'css', name)
+            with open(path, 'wb') as output:
+                output.write(cls.content)
+            compress_file(path)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_STATIC_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_hashed_file_cached_forever(self):
+        """Файл с хешем в имени отдаётся с immutable-кешированием."""
+        response = self.guest_client.get('/static/css/app.0123456789ab.css')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(response['Content-Type'], 'text/css')
+
+    def test_plain_file_short_cache(self):
+        """Файл без хеша кешируется на STATIC_MAX_AGE."""
+        response = self.guest_client.get('/static/css/app.css')
+        self.assertEqual(
+            response['Cache-Control'],
+            f'public, max-age={settings.STATIC_MAX_AGE}'
+        )
+
+    def test_precompressed_file(self):
+        """Клиенту с поддержкой gzip отдаётся заранее сжатая копия."""
+        response = self.guest_client.get(
+            '/static/css/app.css', HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertLess(
+            int(response['Content-Length']), len(self.content)
+        )
+
+    def test_not_modified(self):
+        """Повторный запрос с If-Modified-Since получает 304."""
+        response = self.guest_client.get('/static/css/app.css')
+        response = self.guest_client.get(
+            '/static/css/app.css',
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_path_traversal(self):
+        """Файлы вне STATIC_ROOT не отдаются."""
+        response = self.guest_client.get('/static/../manage.py')
+        self.assertEqual(response.status_code, 404)
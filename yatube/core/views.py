@@ -1,4 +1,24 @@
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse, Http404, HttpResponse, HttpResponseNotModified,
+    StreamingHttpResponse,
+)
 from django.shortcuts import render
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from django.views.static import was_modified_since
+
+
+RANGE_HEADER = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+CHUNK_SIZE = 64 * 1024
 
 
 def forbidden(request, exception):
@@ -15,3 +35,107 @@ def page_not_found(request, exception):
 
 def internal_server_error(request):
     return render(request, 'core/500.html', status=500)
+
+
+def serve_media(request, path):
+    """Отдаёт файлы из MEDIA_ROOT с поддержкой Range и условных запросов.
+
+    При MEDIA_SENDFILE = 'x-sendfile' или 'x-accel-redirect' передачу
+    файла выполняет фронтовой сервер, приложение только ставит заголовок.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        file_stat = os.stat(full_path)
+    except (SuspiciousFileOperation, ValueError, OSError):
+        raise Http404
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise Http404
+    mtime, size = file_stat.st_mtime, file_stat.st_size
+    etag = quote_etag(f'{int(mtime):x}-{size:x}')
+    if (
+        request.META.get('HTTP_IF_NONE_MATCH') == etag
+        or not was_modified_since(
+            request.META.get('HTTP_IF_MODIFIED_SINCE'), mtime, size
+        )
+    ):
+        response = HttpResponseNotModified()
+    else:
+        if settings.MEDIA_SENDFILE:
+            response = sendfile_response(full_path, path)
+        else:
+            byte_range = parse_range(request, size, etag, mtime)
+            response = file_response(full_path, size, byte_range)
+        content_type, _ = mimetypes.guess_type(full_path)
+        response['Content-Type'] = content_type or 'application/octet-stream'
+    response['Last-Modified'] = http_date(mtime)
+    response['ETag'] = etag
+    response['Accept-Ranges'] = 'bytes'
+    response['Cache-Control'] = f'public, max-age={settings.MEDIA_MAX_AGE}'
+    return response
+
+
+def sendfile_response(full_path, path):
+    response = HttpResponse()
+    if settings.MEDIA_SENDFILE == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(path)
+        )
+    else:
+        response['X-Sendfile'] = full_path
+    return response
+
+
+def file_response(full_path, size, byte_range):
+    if byte_range is None:
+        return FileResponse(open(full_path, 'rb'))
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    start, end = byte_range
+    response = StreamingHttpResponse(
+        read_range(full_path, start, end), status=206
+    )
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = end - start + 1
+    return response
+
+
+def parse_range(request, size, etag, mtime):
+    """Возвращает (start, end) для одного диапазона, None — отдать файл
+    целиком, False — диапазон невыполним.
+    """
+    header = request.META.get('HTTP_RANGE')
+    if not header:
+        return None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and if_range != etag and (
+        parse_http_date_safe(if_range) != int(mtime)
+    ):
+        return None
+    match = RANGE_HEADER.match(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def read_range(path, start, end):
+    with open(path, 'rb') as source:
+        source.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = source.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
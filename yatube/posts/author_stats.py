@@ -0,0 +1,21 @@
+from django.core.cache import cache
+
+from .models import Post
+
+
+POST_COUNT_CACHE_KEY = 'author_post_count:{}'
+
+POST_COUNT_TIMEOUT = 60 * 60
+
+
+def author_post_count(author_id):
+    """Число записей автора из кеша; считается только при промахе."""
+    return cache.get_or_set(
+        POST_COUNT_CACHE_KEY.format(author_id),
+        lambda: Post.objects.filter(author_id=author_id).count(),
+        POST_COUNT_TIMEOUT,
+    )
+
+
+def forget_post_count(author_id):
+    cache.delete(POST_COUNT_CACHE_KEY.format(author_id))
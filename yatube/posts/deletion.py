@@ -0,0 +1,57 @@
+from django.db import transaction
+from django.db.models import Count, F
+
+from .author_stats import forget_post_count
+from .group_stats import refresh_group
+from .models import Comment, PendingUserDeletion, Post
+
+
+def soft_delete_post(post):
+    """Скрывает запись одним UPDATE; комментарии, картинку и строку
+    удаляет позже purge_deleted.
+    """
+    if not Post.all_objects.filter(pk=post.pk).soft_delete():
+        return
+    if post.group_id and post.publish_at is None:
+        refresh_group(post.group_id, post.author_id, -1)
+    forget_post_count(post.author_id)
+
+
+def soft_delete_comment(comment):
+    if Comment.objects.filter(pk=comment.pk).soft_delete():
+        Post.objects.filter(pk=comment.post_id).update(
+            comment_count=F('comment_count') - 1
+        )
+
+
+def soft_delete_user(user):
+    """Блокирует пользователя и скрывает его записи и комментарии.
+
+    Каскадное удаление пользователя со всеми данными выполнит
+    purge_deleted небольшими пачками.
+    """
+    with transaction.atomic():
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+        PendingUserDeletion.objects.get_or_create(user=user)
+        groups = list(
+            Post.objects.filter(author=user).exclude(group=None)
+            .values_list('group')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        comments = list(
+            Comment.objects.filter(author=user)
+            .values_list('post')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        Post.all_objects.filter(author=user).soft_delete()
+        Comment.objects.filter(author=user).soft_delete()
+        for group_id, total in groups:
+            refresh_group(group_id, user.pk, -total)
+        for post_id, total in comments:
+            Post.all_objects.filter(pk=post_id).update(
+                comment_count=F('comment_count') - total
+            )
+    forget_post_count(user.pk)
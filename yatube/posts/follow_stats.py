@@ -0,0 +1,57 @@
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .models import Follow, FollowCounter, FollowSuggestion
+
+
+def change_follow_counts(user_id, author_ids, delta):
+    """Сдвигает счётчики подписчика и авторов на delta.
+
+    Недостающие строки создаются одним INSERT ... ON CONFLICT DO
+    NOTHING, затем счётчики меняются двумя UPDATE через F(). Подписки,
+    созданные в обход FollowQuerySet (админка, Follow.objects.create),
+    не учитываются, поэтому счётчик не опускается ниже нуля.
+    """
+    FollowCounter.objects.bulk_create(
+        [FollowCounter(user_id=pk) for pk in (user_id, *author_ids)],
+        ignore_conflicts=True,
+    )
+    FollowCounter.objects.filter(pk=user_id).update(
+        following=Greatest(F('following') + delta * len(author_ids), 0)
+    )
+    FollowCounter.objects.filter(pk__in=author_ids).update(
+        followers=Greatest(F('followers') + delta, 0)
+    )
+
+
+def follower_count(user_id):
+    """Число подписчиков одним чтением строки счётчика."""
+    return FollowCounter.objects.filter(pk=user_id).values_list(
+        'followers', flat=True
+    ).first() or 0
+
+
+def record_follows(user_id, author_ids):
+    change_follow_counts(user_id, author_ids, 1)
+    # Рекомендации «возможно, вы знакомы» не должны предлагать авторов,
+    # на которых пользователь уже подписан.
+    FollowSuggestion.objects.filter(
+        user_id=user_id, suggested_id__in=author_ids
+    ).delete()
+
+
+def forget_follows(user_id):
+    """Удаляет все подписки пользователя и на него, поправляя счётчики
+    остальных участников.
+    """
+    follows = Follow.objects.filter(user_id=user_id)
+    fans = Follow.objects.filter(author_id=user_id)
+    FollowCounter.objects.filter(
+        pk__in=follows.values('author_id')
+    ).update(followers=Greatest(F('followers') - 1, 0))
+    FollowCounter.objects.filter(
+        pk__in=fans.values('user_id')
+    ).update(following=Greatest(F('following') - 1, 0))
+    follows.delete()
+    fans.delete()
+    FollowCounter.objects.filter(pk=user_id).update(followers=0, following=0)
@@ -1,8 +1,13 @@
-from django.forms import ModelForm
+from django.forms import DateTimeField, DateTimeInput, ModelForm
+from django.forms import ValidationError
+from django.utils import timezone
 
 from .models import Post, Comment
 
 
+DATETIME_LOCAL_FORMAT = '%Y-%m-%dT%H:%M'
+
+
 class PostForm(ModelForm):
 
     class Meta:
@@ -20,6 +25,41 @@ class PostForm(ModelForm):
         }
 
 
+class PostScheduleForm(ModelForm):
+    """Время отложенной публикации; выводится рядом с PostForm для
+    новых и ещё не опубликованных записей.
+    """
+
+    publish_at = DateTimeField(
+        required=False,
+        input_formats=[DATETIME_LOCAL_FORMAT],
+        widget=DateTimeInput(
+            attrs={'type': 'datetime-local'},
+            format=DATETIME_LOCAL_FORMAT,
+        ),
+        label='Опубликовать позже (не обязательно)',
+        help_text='Пусто — опубликовать сразу',
+    )
+
+    class Meta:
+        model = Post
+        fields = ('publish_at',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.is_scheduled = self.instance.publish_at is not None
+
+    def clean_publish_at(self):
+        publish_at = self.cleaned_data['publish_at']
+        if publish_at is None:
+            # Отложенную запись без даты опубликует ближайший запуск
+            # publish_scheduled.
+            return timezone.now() if self.is_scheduled else None
+        if not self.is_scheduled and publish_at <= timezone.now():
+            raise ValidationError('Время публикации должно быть в будущем')
+        return publish_at
+
+
 class CommentForm(ModelForm):
 
     class Meta:
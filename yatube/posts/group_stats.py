@@ -0,0 +1,66 @@
+from django.core.cache import cache
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Greatest
+
+from .models import Group, GroupAuthorCount, Post
+
+
+TOP_AUTHORS_CACHE_KEY = 'group_top_authors:{}'
+
+TOP_AUTHORS_TIMEOUT = 60 * 60
+
+NUMBER_OF_TOP_AUTHORS = 3
+
+
+def refresh_group(group_id, author_id, delta):
+    """Сдвигает счётчики группы и автора в ней, пересчитывает дату
+    последней записи.
+
+    Дата берётся одним чтением по индексу (group, -pub_date), поэтому
+    подходит и для создания, и для удаления или переноса записи. Кеш
+    активных авторов сбрасывается только у изменённой группы.
+    """
+    latest = (
+        Post.objects.filter(group=OuterRef('pk'))
+        .order_by('-pub_date')
+        .values('pub_date')[:1]
+    )
+    Group.objects.filter(pk=group_id).update(
+        post_count=F('post_count') + delta,
+        last_post_at=Subquery(latest),
+    )
+    if delta > 0:
+        GroupAuthorCount.objects.bulk_create(
+            [GroupAuthorCount(group_id=group_id, author_id=author_id)],
+            ignore_conflicts=True,
+        )
+    GroupAuthorCount.objects.filter(
+        group_id=group_id, author_id=author_id
+    ).update(post_count=Greatest(F('post_count') + delta, 0))
+    cache.delete(TOP_AUTHORS_CACHE_KEY.format(group_id))
+
+
+def top_authors(group_ids):
+    """Самые активные авторы групп: {group_id: [(username, n)]}.
+
+    Списки хранятся в кеше по группам; при промахе список группы
+    читается из GroupAuthorCount по индексу (group, -post_count).
+    """
+    keys = {TOP_AUTHORS_CACHE_KEY.format(pk): pk for pk in group_ids}
+    authors = {
+        keys[key]: value for key, value in cache.get_many(keys).items()
+    }
+    missing = {}
+    for key, group_id in keys.items():
+        if group_id in authors:
+            continue
+        authors[group_id] = missing[key] = list(
+            GroupAuthorCount.objects.filter(
+                group_id=group_id, post_count__gt=0
+            )
+            .order_by('-post_count', 'author__username')
+            .values_list('author__username', 'post_count')
+            [:NUMBER_OF_TOP_AUTHORS]
+        )
+    cache.set_many(missing, TOP_AUTHORS_TIMEOUT)
+    return authors
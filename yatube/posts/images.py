@@ -0,0 +1,115 @@
+import threading
+from collections import Counter
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from sorl.thumbnail import delete
+from sorl.thumbnail.images import ImageFile
+
+from .models import StoredImage
+from .storage import content_addressed_storage
+
+
+_reserved = threading.local()
+
+
+def _reserved_names():
+    if not hasattr(_reserved, 'names'):
+        _reserved.names = Counter()
+    return _reserved.names
+
+
+def _add_reference(name):
+    """Увеличивает счётчик, создавая строку при необходимости; True,
+    если строка уже была.
+    """
+    updated = StoredImage.objects.filter(name=name).update(
+        ref_count=F('ref_count') + 1
+    )
+    if updated:
+        return True
+    try:
+        with transaction.atomic():
+            StoredImage.objects.create(name=name, ref_count=1)
+        return False
+    except IntegrityError:
+        StoredImage.objects.filter(name=name).update(
+            ref_count=F('ref_count') + 1
+        )
+        return True
+
+
+def reserve_image(name, place_file):
+    """Берёт ссылку на файл при загрузке, до того как имя попадёт в пост.
+
+    Иначе параллельный release_image мог бы удалить уже существующий
+    файл между проверкой в хранилище и сохранением поста. place_file
+    вызывается в той же транзакции с признаком «строка уже была»: если
+    строки не было, файл записывается заново. Зарезервированную ссылку
+    затем забирает acquire_image в том же потоке, а незабранную
+    возвращает release_reservation или release_reservations.
+    """
+    with transaction.atomic():
+        place_file(_add_reference(name))
+    _reserved_names()[name] += 1
+
+
+def release_reservation(name):
+    """Возвращает резерв, который пост не забрал: при правке загружен
+    тот же файл, и имя картинки не изменилось.
+    """
+    reserved = _reserved_names()
+    if reserved[name]:
+        reserved[name] -= 1
+        release_image(name)
+
+
+def release_reservations():
+    """Возвращает все незабранные резервы потока (сохранение сорвалось).
+
+    Иначе лишняя ссылка навсегда осталась бы в StoredImage, а резерв
+    заставил бы следующий acquire_image пропустить увеличение счётчика.
+    """
+    reserved = _reserved_names()
+    names = list(reserved.elements())
+    reserved.clear()
+    for name in names:
+        release_image(name)
+
+
+def acquire_image(name):
+    """Увеличивает счётчик ссылок на файл картинки."""
+    if not name:
+        return
+    reserved = _reserved_names()
+    if reserved[name]:
+        reserved[name] -= 1
+        return
+    _add_reference(name)
+
+
+def release_image(name):
+    """Уменьшает счётчик ссылок и удаляет файл с миниатюрами,
+    когда на него больше никто не ссылается.
+    """
+    if not name:
+        return
+    with transaction.atomic():
+        StoredImage.objects.filter(name=name).update(
+            ref_count=F('ref_count') - 1
+        )
+        deleted, _ = StoredImage.objects.filter(
+            name=name, ref_count__lte=0
+        ).delete()
+    if deleted:
+        transaction.on_commit(lambda: delete_image_files(name))
+
+
+def delete_image_files(name):
+    if StoredImage.objects.filter(name=name).exists():
+        return
+    try:
+        delete(ImageFile(name, storage=content_addressed_storage))
+    except SuspiciousFileOperation:
+        pass
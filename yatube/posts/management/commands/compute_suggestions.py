@@ -0,0 +1,68 @@
+from itertools import groupby, islice
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max, Min
+
+from posts.models import Follow, FollowSuggestion, User
+
+
+FRIENDS_OF_FRIENDS_SQL = '''
+    SELECT f1.user_id, f2.author_id, COUNT(*) AS score
+    FROM {follow} f1
+    JOIN {follow} f2 ON f2.user_id = f1.author_id
+    WHERE f1.user_id BETWEEN %s AND %s
+      AND f2.author_id <> f1.user_id
+      AND NOT EXISTS (
+          SELECT 1 FROM {follow} f3
+          WHERE f3.user_id = f1.user_id AND f3.author_id = f2.author_id
+      )
+    GROUP BY f1.user_id, f2.author_id
+    ORDER BY f1.user_id, score DESC, f2.author_id
+'''
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рекомендации "возможно, вы знакомы": авторов, на '
+        'которых подписаны ваши авторы, по числу общих подписок.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=10)
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Сколько пользователей обрабатывать одним запросом.',
+        )
+
+    def handle(self, *args, **options):
+        bounds = User.objects.aggregate(first=Min('id'), last=Max('id'))
+        if bounds['first'] is None:
+            return
+        sql = FRIENDS_OF_FRIENDS_SQL.format(
+            follow=connection.ops.quote_name(Follow._meta.db_table)
+        )
+        total = 0
+        chunk_size = options['chunk_size']
+        for start in range(bounds['first'], bounds['last'] + 1, chunk_size):
+            end = start + chunk_size - 1
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [start, end])
+                suggestions = [
+                    FollowSuggestion(
+                        user_id=user_id,
+                        suggested_id=suggested_id,
+                        score=score,
+                    )
+                    for user_id, rows in groupby(cursor, lambda r: r[0])
+                    for _, suggested_id, score in islice(rows, options['top'])
+                ]
+            with transaction.atomic():
+                FollowSuggestion.objects.filter(
+                    user_id__gte=start, user_id__lte=end
+                ).delete()
+                FollowSuggestion.objects.bulk_create(
+                    suggestions, batch_size=1000
+                )
+            total += len(suggestions)
+        self.stdout.write(f'Сохранено рекомендаций: {total}')
@@ -0,0 +1,71 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Max
+
+from posts.models import Comment, FollowCounter, Group, Post
+from posts.trending import hot_score, post_activity
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает оценки популярности записей и групп: число '
+        'комментариев, охват подписчиков автора и затухание по времени.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        comments = {
+            row['post']: row
+            for row in Comment.objects.values('post')
+            .annotate(total=Count('id'), last=Max('created'))
+            .order_by()
+        }
+        reach = dict(
+            FollowCounter.objects.values_list('user_id', 'followers')
+        )
+        group_activity = {}
+        group_last = {}
+        total = 0
+        batch = []
+        posts = Post.objects.only('id', 'pub_date', 'author', 'group')
+        for post in posts.order_by().iterator(chunk_size=batch_size):
+            stats = comments.get(post.id, {'total': 0, 'last': None})
+            activity = post_activity(
+                stats['total'], reach.get(post.author_id, 0)
+            )
+            post.comment_count = stats['total']
+            post.trend_score = hot_score(activity, post.pub_date)
+            batch.append(post)
+            total += 1
+            if post.group_id:
+                group_activity[post.group_id] = (
+                    group_activity.get(post.group_id, 0) + activity
+                )
+                group_last[post.group_id] = max(
+                    filter(None, (
+                        group_last.get(post.group_id),
+                        post.pub_date,
+                        stats['last'],
+                    ))
+                )
+            if len(batch) >= batch_size:
+                Post.objects.bulk_update(
+                    batch, ['comment_count', 'trend_score']
+                )
+                batch = []
+        Post.objects.bulk_update(batch, ['comment_count', 'trend_score'])
+        groups = list(Group.objects.only('id'))
+        for group in groups:
+            group.activity = group_activity.get(group.id, 0)
+            group.trend_score = (
+                hot_score(group.activity, group_last[group.id])
+                if group.id in group_last else 0
+            )
+        Group.objects.bulk_update(
+            groups, ['activity', 'trend_score'], batch_size=batch_size
+        )
+        self.stdout.write(
+            f'Пересчитано записей: {total}, групп: {len(groups)}'
+        )
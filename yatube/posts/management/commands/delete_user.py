@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.deletion import soft_delete_user
+from posts.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Блокирует пользователя и скрывает его записи и комментарии; '
+        'данные окончательно удалит purge_deleted.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f'Пользователь {options["username"]} не найден')
+        soft_delete_user(user)
+        self.stdout.write(f'Пользователь {user.username} удалён')
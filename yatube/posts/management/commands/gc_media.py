@@ -0,0 +1,144 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from posts.images import delete_image_files
+from posts.models import Post, StoredImage
+from posts.storage import TEMP_DIR
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет картинки постов и их миниатюры, на которые не ссылается '
+        'ни один пост, и временные файлы брошенных загрузок. Файлы '
+        'проверяются пачками, память не зависит от числа файлов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true')
+        parser.add_argument(
+            '--quarantine',
+            help='Переносить файлы в этот каталог вместо удаления.',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument(
+            '--min-age', type=int, default=3600,
+            help='Не трогать файлы моложе N секунд (идущие загрузки).',
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.root = settings.MEDIA_ROOT
+        self.scanned = self.orphans = self.freed = 0
+        upload_to = Post._meta.get_field('image').upload_to
+        top = os.path.join(self.root, upload_to)
+        pending = set()
+        with ThreadPoolExecutor(options['workers']) as pool:
+            for batch in self.batches(self.walk(top)):
+                if len(pending) >= options['workers'] * 2:
+                    done, pending = wait(
+                        pending, return_when=FIRST_COMPLETED
+                    )
+                    self.count(done)
+                pending.add(pool.submit(self.collect, batch))
+        self.count(pending)
+        self.sweep_temp()
+        self.stdout.write(
+            f'Проверено файлов: {self.scanned}, '
+            f'без ссылок: {self.orphans}, '
+            f'освобождено байт: {self.freed}'
+            + (' (dry run)' if options['dry_run'] else '')
+        )
+
+    def walk(self, top):
+        deadline = time.time() - self.options['min_age']
+        stack = [top]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except FileNotFoundError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    stat = entry.stat(follow_symlinks=False)
+                    self.scanned += 1
+                    if stat.st_mtime < deadline:
+                        name = os.path.relpath(entry.path, self.root)
+                        yield name.replace(os.sep, '/'), stat.st_size
+
+    def sweep_temp(self):
+        """Удаляет временные файлы брошенных загрузок старше --min-age."""
+        for name, size in self.walk(os.path.join(self.root, TEMP_DIR)):
+            self.orphans += 1
+            self.freed += size
+            if self.options['dry_run']:
+                self.stdout.write(f'Брошенная загрузка: {name}')
+                continue
+            try:
+                os.remove(os.path.join(self.root, name))
+            except FileNotFoundError:
+                pass
+
+    def batches(self, files):
+        batch = {}
+        for name, size in files:
+            batch[name] = size
+            if len(batch) >= self.options['batch_size']:
+                yield batch
+                batch = {}
+        if batch:
+            yield batch
+
+    def count(self, futures):
+        for future in futures:
+            orphans, freed = future.result()
+            self.orphans += orphans
+            self.freed += freed
+
+    def collect(self, batch):
+        try:
+            referenced = set(
+                Post.all_objects.filter(image__in=batch)
+                .values_list('image', flat=True)
+            )
+            orphans = {
+                name: size for name, size in batch.items()
+                if name not in referenced
+            }
+            removed = [name for name in orphans if self.remove(name)]
+            return len(removed), sum(orphans[name] for name in removed)
+        finally:
+            connection.close()
+
+    def remove(self, name):
+        if self.options['dry_run']:
+            self.stdout.write(f'Без ссылок: {name}')
+            return True
+        with transaction.atomic():
+            # Файлам без строки (загруженным до подсчёта ссылок) строка
+            # заводится с нулём ссылок. Удаление строки с ref_count=0
+            # блокирует её до конца транзакции: ссылка, взятая после
+            # collect(), либо не даст удалить строку, либо дождётся
+            # коммита и запишет файл заново.
+            StoredImage.objects.get_or_create(name=name)
+            deleted, _ = StoredImage.objects.filter(
+                name=name, ref_count=0
+            ).delete()
+            if not deleted:
+                return False
+            quarantine = self.options['quarantine']
+            if quarantine:
+                os.renames(
+                    os.path.join(self.root, name),
+                    os.path.join(quarantine, name),
+                )
+            delete_image_files(name)
+        return True
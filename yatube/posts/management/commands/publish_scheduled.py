@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.scheduling import publish_due
+
+
+class Command(BaseCommand):
+    help = (
+        'Публикует отложенные записи, время которых наступило, пачками '
+        'и обновляет счётчики и ленты подписчиков.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать постоянно, проверяя записи каждые --interval с.',
+        )
+        parser.add_argument('--interval', type=float, default=5)
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            published = publish_due(options['batch_size'])
+            total += published
+            if published:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(f'Опубликовано: {total}')
@@ -0,0 +1,73 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from posts.follow_stats import forget_follows
+from posts.models import Comment, PendingUserDeletion, Post, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Окончательно удаляет мягко удалённые записи, комментарии и '
+        'пользователей небольшими пачками, освобождая картинки и счётчики.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--grace-hours', type=float, default=24,
+            help='Сколько часов хранить удалённое до очистки.',
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0,
+            help='Пауза между пачками, с.',
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.pause = options['pause']
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        comments = self.purge(Comment.all_objects.filter(
+            Q(deleted_at__lte=cutoff) | Q(post__deleted_at__lte=cutoff)
+        ))
+        posts = self.purge(Post.all_objects.filter(deleted_at__lte=cutoff))
+        users = 0
+        pending = PendingUserDeletion.objects.filter(
+            requested__lte=cutoff
+        ).values_list('user_id', flat=True)
+        for user_id in pending:
+            with transaction.atomic():
+                forget_follows(user_id)
+            has_content = (
+                Post.all_objects.filter(author_id=user_id).exists()
+                or Comment.all_objects.filter(author_id=user_id).exists()
+            )
+            if not has_content:
+                User.objects.filter(pk=user_id).delete()
+                users += 1
+        self.stdout.write(
+            f'Удалено комментариев: {comments}, записей: {posts}, '
+            f'пользователей: {users}'
+        )
+
+    def purge(self, queryset):
+        """Удаляет queryset пачками по batch_size в отдельных
+        транзакциях; сигналы post_delete освобождают картинки и
+        сбрасывают кеши.
+        """
+        total = 0
+        while True:
+            ids = list(
+                queryset.order_by().values_list('pk', flat=True)
+                [:self.batch_size]
+            )
+            if not ids:
+                return total
+            queryset.model._base_manager.filter(pk__in=ids).delete()
+            total += len(ids)
+            if self.pause:
+                time.sleep(self.pause)
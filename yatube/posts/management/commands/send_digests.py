@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+from itertools import groupby, islice
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from posts.models import Digest, DigestRun, Follow, Post, User
+
+
+PERIOD_EPOCH = datetime(2022, 1, 1, tzinfo=timezone.utc)
+
+
+class Command(BaseCommand):
+    help = (
+        'Собирает для каждого подписчика новые записи его авторов за '
+        'последний завершённый период и рассылает по одному дайджесту. '
+        'Прерванная рассылка продолжается с места остановки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--period-hours', type=int, default=24)
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Сколько id подписчиков обрабатывать одним запросом.',
+        )
+        parser.add_argument('--max-posts', type=int, default=10)
+
+    def handle(self, *args, **options):
+        period = timedelta(hours=options['period_hours'])
+        now = timezone.now()
+        period_end = now - (now - PERIOD_EPOCH) % period
+        # Сначала дописываем рассылки, прерванные в прошлых периодах.
+        runs = list(
+            DigestRun.objects.filter(
+                finished=None, period_end__lt=period_end
+            ).order_by('period_end')
+        )
+        run, _ = DigestRun.objects.get_or_create(period_end=period_end)
+        if run.finished:
+            self.stdout.write(f'Дайджесты за {period_end} уже разосланы')
+        else:
+            runs.append(run)
+        for run in runs:
+            total = self.send_run(run, period, options)
+            self.stdout.write(f'Дайджестов за {run.period_end}: {total}')
+
+    def send_run(self, run, period, options):
+        last_user_id = (
+            Follow.objects.aggregate(last=Max('user_id'))['last'] or 0
+        )
+        total = 0
+        while run.last_user_id < last_user_id:
+            total += self.send_chunk(
+                run, run.period_end - period,
+                run.last_user_id + options['chunk_size'],
+                options['max_posts'],
+            )
+        run.finished = timezone.now()
+        run.save(update_fields=['finished'])
+        return total
+
+    def send_chunk(self, run, period_start, last_user_id, max_posts):
+        """Один запрос на пачку подписчиков: новые записи всех их
+        авторов, упорядоченные по подписчику и дате.
+        """
+        rows = (
+            Post.objects.filter(
+                author__following__user_id__gt=run.last_user_id,
+                author__following__user_id__lte=last_user_id,
+                pub_date__gt=period_start,
+                pub_date__lte=run.period_end,
+            )
+            .order_by('author__following__user_id', '-pub_date', '-id')
+            .values_list(
+                'author__following__user_id', 'id', 'text',
+                'author__username',
+            )
+        )
+        digests = {}
+        for user_id, posts in groupby(rows.iterator(), lambda r: r[0]):
+            posts = list(posts)
+            digests[user_id] = (len(posts), [
+                {'id': post_id, 'text': text, 'author': author}
+                for _, post_id, text, author in islice(posts, max_posts)
+            ])
+        # Пользователи, удалённые через delete_user, уже неактивны.
+        recipients = list(
+            User.objects.filter(id__in=digests, is_active=True)
+            .values_list('id', 'username', 'email')
+        )
+        digests = {
+            user_id: digests[user_id] for user_id, _, _ in recipients
+        }
+        messages = [
+            EmailMessage(
+                f'Новые записи ваших авторов: {digests[user_id][0]}',
+                render_to_string('posts/email/digest.txt', {
+                    'username': username,
+                    'post_count': digests[user_id][0],
+                    'posts': digests[user_id][1],
+                    'site_url': settings.SITE_URL,
+                }),
+                to=[email],
+            )
+            for user_id, username, email in recipients if email
+        ]
+        with transaction.atomic():
+            Digest.objects.bulk_create(
+                [
+                    Digest(
+                        user_id=user_id,
+                        period_start=period_start,
+                        period_end=run.period_end,
+                        post_count=post_count,
+                    )
+                    for user_id, (post_count, _) in digests.items()
+                ],
+                batch_size=1000,
+                ignore_conflicts=True,
+            )
+            if messages:
+                get_connection().send_messages(messages)
+            run.last_user_id = last_user_id
+            run.save(update_fields=['last_user_id'])
+        return len(digests)
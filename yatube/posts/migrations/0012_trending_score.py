@@ -0,0 +1,72 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:24
+
+import math
+from datetime import datetime, timezone
+
+from django.db import migrations, models
+
+
+# Формула оценки на момент миграции: posts.trending.hot_score с
+# TRENDING_DECAY_SECONDS = 12 ч и TRENDING_COMMENT_WEIGHT = 1. Копия,
+# чтобы изменения модуля не меняли уже применённую миграцию.
+TRENDING_EPOCH = datetime(2022, 1, 1, tzinfo=timezone.utc)
+
+TRENDING_DECAY_SECONDS = 12 * 60 * 60
+
+TRENDING_COMMENT_WEIGHT = 1.0
+
+
+def hot_score(activity, moment):
+    age = (moment - TRENDING_EPOCH).total_seconds()
+    return math.log10(max(activity, 1)) + age / TRENDING_DECAY_SECONDS
+
+
+def score_posts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('posts', 'Comment')
+    counts = dict(
+        Comment.objects.values('post')
+        .annotate(total=models.Count('id'))
+        .order_by()
+        .values_list('post', 'total')
+    )
+    posts = list(Post.objects.only('id', 'pub_date'))
+    for post in posts:
+        post.comment_count = counts.get(post.id, 0)
+        post.trend_score = hot_score(
+            post.comment_count * TRENDING_COMMENT_WEIGHT, post.pub_date
+        )
+    Post.objects.bulk_update(
+        posts, ['comment_count', 'trend_score'], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_follow_suggestion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='activity',
+            field=models.FloatField(default=0, verbose_name='Активность'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='trend_score',
+            field=models.FloatField(db_index=True, default=0, verbose_name='Популярность'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Число комментариев'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='trend_score',
+            field=models.FloatField(db_index=True, default=0, verbose_name='Популярность'),
+        ),
+        migrations.RunPython(score_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:25
+
+from django.db import migrations, models
+
+
+def count_group_posts(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    Post = apps.get_model('posts', 'Post')
+    stats = (
+        Post.objects.exclude(group=None)
+        .values('group')
+        .annotate(total=models.Count('id'), last=models.Max('pub_date'))
+        .order_by()
+    )
+    for row in stats.iterator():
+        Group.objects.filter(pk=row['group']).update(
+            post_count=row['total'], last_post_at=row['last']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_trending_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='last_post_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Последняя запись'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Число записей'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['group', '-pub_date'], name='post_group_pub_date_idx'),
+        ),
+        migrations.RunPython(count_group_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:33
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0011_update_proxy_permissions'),
+        ('posts', '0014_digest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnreadCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='unread_counter', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Подписчик')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Непрочитанных записей')),
+            ],
+            options={
+                'verbose_name': 'Счётчик непрочитанного',
+                'verbose_name_plural': 'Счётчики непрочитанного',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0017_post_revision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='publish_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='Дата и время отложенной публикации (не обязательно)', null=True, verbose_name='Опубликовать'),
+        ),
+    ]
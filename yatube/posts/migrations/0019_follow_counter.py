@@ -0,0 +1,50 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:48
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def count_follows(apps, schema_editor):
+    Follow = apps.get_model('posts', 'Follow')
+    FollowCounter = apps.get_model('posts', 'FollowCounter')
+    counters = {}
+    for field, column in (('author', 'followers'), ('user', 'following')):
+        rows = (
+            Follow.objects.values_list(field)
+            .annotate(total=models.Count('id'))
+            .order_by()
+        )
+        for user_id, total in rows.iterator():
+            counters.setdefault(user_id, {})[column] = total
+    FollowCounter.objects.bulk_create(
+        [
+            FollowCounter(user_id=user_id, **values)
+            for user_id, values in counters.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0011_update_proxy_permissions'),
+        ('posts', '0018_post_publish_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FollowCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='follow_counter', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+                ('followers', models.PositiveIntegerField(default=0, verbose_name='Подписчиков')),
+                ('following', models.PositiveIntegerField(default=0, verbose_name='Подписок')),
+            ],
+            options={
+                'verbose_name': 'Счётчик подписок',
+                'verbose_name_plural': 'Счётчики подписок',
+            },
+        ),
+        migrations.RunPython(count_follows, migrations.RunPython.noop),
+    ]
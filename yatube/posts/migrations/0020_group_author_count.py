@@ -0,0 +1,58 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:49
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def count_group_authors(apps, schema_editor):
+    GroupAuthorCount = apps.get_model('posts', 'GroupAuthorCount')
+    Post = apps.get_model('posts', 'Post')
+    rows = (
+        Post.objects.filter(deleted_at=None, publish_at=None)
+        .exclude(group=None)
+        .values_list('group', 'author')
+        .annotate(total=models.Count('id'))
+        .order_by()
+    )
+    GroupAuthorCount.objects.bulk_create(
+        [
+            GroupAuthorCount(group_id=group_id, author_id=author_id,
+                             post_count=total)
+            for group_id, author_id, total in rows.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0019_follow_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupAuthorCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Число записей')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='posts.Group', verbose_name='Группа')),
+            ],
+            options={
+                'verbose_name': 'Записи автора в группе',
+                'verbose_name_plural': 'Записи авторов в группах',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='groupauthorcount',
+            index=models.Index(fields=['group', '-post_count'], name='group_author_count_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='groupauthorcount',
+            constraint=models.UniqueConstraint(fields=('group', 'author'), name='unique_group_author_count'),
+        ),
+        migrations.RunPython(count_group_authors, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,17 @@
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.db.models.sql import InsertQuery
 from django.contrib.auth import get_user_model
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .storage import content_addressed_storage
+
+
+# Отправляются внутри транзакции подписки со списком авторов, подписка
+# на которых действительно создана или удалена этим вызовом.
+followed = Signal(providing_args=['user', 'authors'])
+unfollowed = Signal(providing_args=['user', 'authors'])
+posts_published = Signal(providing_args=['posts'])
 
 
 User = get_user_model()
@@ -14,6 +26,24 @@ class Group(models.Model):
         verbose_name='SLUG',
     )
     description = models.TextField(verbose_name='Описание')
+    activity = models.FloatField(
+        default=0,
+        verbose_name='Активность',
+    )
+    trend_score = models.FloatField(
+        default=0,
+        db_index=True,
+        verbose_name='Популярность',
+    )
+    post_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Число записей',
+    )
+    last_post_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Последняя запись',
+    )
 
     class Meta:
         ordering = ['title']
@@ -24,6 +54,30 @@ class Group(models.Model):
         return self.title
 
 
+class SoftDeleteQuerySet(models.QuerySet):
+    def soft_delete(self):
+        return self.filter(deleted_at=None).update(deleted_at=timezone.now())
+
+    def alive(self):
+        return self.filter(deleted_at=None)
+
+
+class AliveManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """Менеджер по умолчанию: скрывает мягко удалённые объекты, в том
+    числе в связанных менеджерах (author.posts, post.comments).
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at=None)
+
+
+class PublishedManager(AliveManager):
+    """Скрывает ещё и отложенные записи, которые ждут publish_scheduled."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(publish_at=None)
+
+
 class Post(models.Model):
     text = models.TextField(
         'Текст поста',
@@ -52,14 +106,50 @@ class Post(models.Model):
     image = models.ImageField(
         'Картинка',
         upload_to='posts/',
+        storage=content_addressed_storage,
         blank=True,
         help_text='Выберите картинку (не обязательно)',
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Число комментариев',
+    )
+    trend_score = models.FloatField(
+        default=0,
+        db_index=True,
+        verbose_name='Популярность',
+    )
+    deleted_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        db_index=True,
+        verbose_name='Дата удаления',
+    )
+    publish_at = models.DateTimeField(
+        'Опубликовать',
+        blank=True,
+        null=True,
+        db_index=True,
+        help_text='Дата и время отложенной публикации (не обязательно)',
+    )
+
+    objects = PublishedManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
 
     class Meta:
         ordering = ['-pub_date']
         verbose_name = 'Пост'
         verbose_name_plural = 'Посты'
+        indexes = [
+            models.Index(
+                fields=['group', '-pub_date'],
+                name='post_group_pub_date_idx',
+            ),
+            models.Index(
+                fields=['author', '-pub_date'],
+                name='post_author_pub_date_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.text[:15]
@@ -86,16 +176,111 @@ class Comment(models.Model):
         auto_now_add=True,
         verbose_name='Дата публикации',
     )
+    deleted_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        db_index=True,
+        verbose_name='Дата удаления',
+    )
+
+    objects = AliveManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
 
     class Meta:
         ordering = ['-created']
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=['post', '-created', '-id'],
+                name='comment_post_created_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.post.text[:15]
 
 
+class FollowQuerySet(models.QuerySet):
+    def _insert_ignoring_conflicts(self, db, follows):
+        query = InsertQuery(self.model, ignore_conflicts=True)
+        query.insert_values(
+            [self.model._meta.get_field('user'),
+             self.model._meta.get_field('author')],
+            follows,
+        )
+        with connections[db].cursor() as cursor:
+            for statement, params in query.get_compiler(db).as_sql():
+                cursor.execute(statement, params)
+            return cursor.rowcount
+
+    def follow(self, user, author):
+        """Подписка одним INSERT ... ON CONFLICT DO NOTHING.
+
+        Возвращает True, если подписка создана этим вызовом; повторный
+        или параллельный вызов не падает на unique_follow.
+        """
+        db = router.db_for_write(self.model)
+        with transaction.atomic(using=db):
+            created = self._insert_ignoring_conflicts(
+                db, [self.model(user=user, author=author)]
+            ) > 0
+            if created:
+                followed.send(sender=self.model, user=user, authors=[author])
+        return created
+
+    def follow_many(self, user, authors):
+        """Подписка на несколько авторов сразу; возвращает число новых.
+
+        Каждая подписка вставляется своим INSERT ... ON CONFLICT DO
+        NOTHING: по rowcount видно, какие строки созданы именно этим
+        вызовом, даже если параллельный запрос вставил часть из них.
+        """
+        authors = [author for author in authors if author.pk != user.pk]
+        if not authors:
+            return 0
+        db = router.db_for_write(self.model)
+        with transaction.atomic(using=db):
+            new_authors = [
+                author for author in authors
+                if self._insert_ignoring_conflicts(
+                    db, [self.model(user=user, author=author)]
+                )
+            ]
+            if new_authors:
+                followed.send(
+                    sender=self.model, user=user, authors=new_authors
+                )
+        return len(new_authors)
+
+    def unfollow(self, user, author):
+        """Отписка одним DELETE; True, если подписка была."""
+        db = router.db_for_write(self.model)
+        with transaction.atomic(using=db):
+            deleted, _ = self.filter(user=user, author=author).delete()
+            if deleted:
+                unfollowed.send(
+                    sender=self.model, user=user, authors=[author]
+                )
+        return bool(deleted)
+
+    def unfollow_many(self, user, authors):
+        """Отписка от нескольких авторов; возвращает число удалённых.
+
+        Как и в follow_many, каждая строка удаляется своим DELETE, чтобы
+        сигнал получили только реально удалённые подписки.
+        """
+        db = router.db_for_write(self.model)
+        with transaction.atomic(using=db):
+            removed = [
+                author for author in authors
+                if self.using(db).filter(user=user, author=author).delete()[0]
+            ]
+            if removed:
+                unfollowed.send(sender=self.model, user=user, authors=removed)
+        return len(removed)
+
+
 class Follow(models.Model):
     user = models.ForeignKey(
         User,
@@ -110,6 +295,8 @@ class Follow(models.Model):
         verbose_name='Автор записей',
     )
 
+    objects = FollowQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Подписчик'
         verbose_name_plural = 'Подписчики'
@@ -120,3 +307,258 @@ class Follow(models.Model):
 
     def __str__(self):
         return f'{self.user} --> {self.author}'
+
+
+class StoredImage(models.Model):
+    name = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name='Файл',
+    )
+    ref_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Число ссылок',
+    )
+
+    class Meta:
+        verbose_name = 'Картинка'
+        verbose_name_plural = 'Картинки'
+
+    def __str__(self):
+        return f'{self.name} ({self.ref_count})'
+
+
+class GroupAuthorCount(models.Model):
+    """Число записей автора в группе для списка активных авторов;
+    поддерживается refresh_group.
+    """
+
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Группа',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Автор',
+    )
+    post_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Число записей',
+    )
+
+    class Meta:
+        verbose_name = 'Записи автора в группе'
+        verbose_name_plural = 'Записи авторов в группах'
+        constraints = [models.UniqueConstraint(
+            fields=['group', 'author'],
+            name='unique_group_author_count')
+        ]
+        indexes = [
+            models.Index(
+                fields=['group', '-post_count'],
+                name='group_author_count_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.group_id}/{self.author_id}: {self.post_count}'
+
+
+class FollowCounter(models.Model):
+    """Число подписчиков и подписок пользователя; обновляется
+    получателями followed/unfollowed в транзакции подписки.
+    """
+
+    user = models.OneToOneField(
+        User,
+        primary_key=True,
+        related_name='follow_counter',
+        on_delete=models.CASCADE,
+        verbose_name='Пользователь',
+    )
+    followers = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Подписчиков',
+    )
+    following = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Подписок',
+    )
+
+    class Meta:
+        verbose_name = 'Счётчик подписок'
+        verbose_name_plural = 'Счётчики подписок'
+
+    def __str__(self):
+        return f'{self.user}: {self.followers}/{self.following}'
+
+
+class FollowSuggestion(models.Model):
+    user = models.ForeignKey(
+        User,
+        related_name='follow_suggestions',
+        on_delete=models.CASCADE,
+        verbose_name='Пользователь',
+    )
+    suggested = models.ForeignKey(
+        User,
+        related_name='+',
+        on_delete=models.CASCADE,
+        verbose_name='Рекомендуемый автор',
+    )
+    score = models.PositiveIntegerField(
+        verbose_name='Общих подписок',
+    )
+
+    class Meta:
+        ordering = ['-score']
+        verbose_name = 'Рекомендация'
+        verbose_name_plural = 'Рекомендации'
+        constraints = [models.UniqueConstraint(
+            fields=['user', 'suggested'],
+            name='unique_follow_suggestion')
+        ]
+        indexes = [
+            models.Index(
+                fields=['user', '-score'],
+                name='suggestion_user_score_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.user} ?-> {self.suggested}'
+
+
+class Digest(models.Model):
+    user = models.ForeignKey(
+        User,
+        related_name='digests',
+        on_delete=models.CASCADE,
+        verbose_name='Подписчик',
+    )
+    period_start = models.DateTimeField(verbose_name='Начало периода')
+    period_end = models.DateTimeField(verbose_name='Конец периода')
+    post_count = models.PositiveIntegerField(
+        verbose_name='Новых записей',
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания',
+    )
+
+    class Meta:
+        ordering = ['-period_end']
+        verbose_name = 'Дайджест'
+        verbose_name_plural = 'Дайджесты'
+        constraints = [models.UniqueConstraint(
+            fields=['user', 'period_end'],
+            name='unique_digest_period')
+        ]
+
+    def __str__(self):
+        return f'{self.user}: {self.post_count} ({self.period_end})'
+
+
+class DigestRun(models.Model):
+    period_end = models.DateTimeField(
+        unique=True,
+        verbose_name='Конец периода',
+    )
+    last_user_id = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Обработаны подписчики до id',
+    )
+    finished = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Дата завершения',
+    )
+
+    class Meta:
+        verbose_name = 'Рассылка дайджестов'
+        verbose_name_plural = 'Рассылки дайджестов'
+
+    def __str__(self):
+        return f'{self.period_end} ({self.last_user_id})'
+
+
+class UnreadCounter(models.Model):
+    user = models.OneToOneField(
+        User,
+        primary_key=True,
+        related_name='unread_counter',
+        on_delete=models.CASCADE,
+        verbose_name='Подписчик',
+    )
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Непрочитанных записей',
+    )
+
+    class Meta:
+        verbose_name = 'Счётчик непрочитанного'
+        verbose_name_plural = 'Счётчики непрочитанного'
+
+    def __str__(self):
+        return f'{self.user}: {self.count}'
+
+
+class PendingUserDeletion(models.Model):
+    user = models.OneToOneField(
+        User,
+        primary_key=True,
+        related_name='+',
+        on_delete=models.CASCADE,
+        verbose_name='Пользователь',
+    )
+    requested = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата запроса',
+    )
+
+    class Meta:
+        verbose_name = 'Удаление пользователя'
+        verbose_name_plural = 'Удаления пользователей'
+
+    def __str__(self):
+        return f'{self.user} ({self.requested})'
+
+
+class PostRevision(models.Model):
+    """Редакция текста записи: снимок или дельта к предыдущей редакции.
+
+    Данные сжаты zlib; как их читать, знает posts.revisions.
+    """
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='revisions',
+        verbose_name='Пост',
+    )
+    number = models.PositiveIntegerField(verbose_name='Номер редакции')
+    is_snapshot = models.BooleanField(
+        default=False,
+        verbose_name='Полный текст',
+    )
+    data = models.BinaryField(verbose_name='Данные')
+    created = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Дата редакции',
+    )
+
+    class Meta:
+        ordering = ['post', 'number']
+        verbose_name = 'Редакция поста'
+        verbose_name_plural = 'Редакции постов'
+        constraints = [models.UniqueConstraint(
+            fields=['post', 'number'],
+            name='unique_post_revision')
+        ]
+
+    def __str__(self):
+        return f'{self.post_id} #{self.number}'
@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Post, posts_published
+
+
+def publish_due(batch_size, now=None):
+    """Публикует пачку отложенных записей, время которых наступило.
+
+    Записи выбираются по индексу publish_at и публикуются одним UPDATE;
+    дата публикации становится запланированной. Счётчики, ленты
+    подписчиков и SSE обновляют получатели posts_published, как и для
+    обычных записей. Возвращает число опубликованных записей.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        posts = list(
+            Post.all_objects.alive()
+            .filter(publish_at__lte=now)
+            .order_by('publish_at')
+            .select_for_update(skip_locked=True)[:batch_size]
+        )
+        if not posts:
+            return 0
+        Post.all_objects.filter(pk__in=[post.pk for post in posts]).update(
+            pub_date=F('publish_at'), publish_at=None
+        )
+        for post in posts:
+            post.pub_date, post.publish_at = post.publish_at, None
+        posts_published.send(sender=Post, posts=posts)
+    return len(posts)
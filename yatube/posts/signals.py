@@ -0,0 +1,186 @@
+from collections import Counter
+
+from django.core.signals import request_finished
+from django.db.models.signals import (
+    post_delete, post_init, post_save, pre_save
+)
+from django.db import transaction
+from django.dispatch import receiver
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from core.events import publish
+
+from .author_stats import forget_post_count
+from .follow_stats import (
+    change_follow_counts, follower_count, record_follows
+)
+from .group_stats import refresh_group
+from .images import (
+    acquire_image, release_image, release_reservation, release_reservations
+)
+from .models import (
+    Comment, Follow, Post, followed, posts_published, unfollowed
+)
+from .revisions import record_revision
+from .trending import hot_score, post_activity, record_comment, record_post
+from .unread import add_unread
+
+
+@receiver(post_init, sender=Post)
+def remember_original(sender, instance, **kwargs):
+    image = instance.__dict__.get('image')
+    instance._original_image = getattr(image, 'name', image)
+    instance._original_group_id = instance.__dict__.get('group_id')
+    instance._original_text = instance.__dict__.get('text')
+
+
+@receiver(post_save, sender=Post)
+def count_image_refs(sender, instance, created, **kwargs):
+    original = getattr(instance, '_original_image', None)
+    if created:
+        acquire_image(instance.image.name)
+    elif original is not None and original != instance.image.name:
+        acquire_image(instance.image.name)
+        release_image(original)
+    elif original is not None:
+        release_reservation(instance.image.name)
+    if 'image' in instance.__dict__:
+        instance._original_image = instance.image.name
+
+
+@receiver(request_finished)
+def return_image_reservations(sender, **kwargs):
+    release_reservations()
+
+
+@receiver(post_delete, sender=Post)
+def release_post_image(sender, instance, **kwargs):
+    release_image(instance.image.name)
+
+
+@receiver(post_save, sender=Post)
+def announce_new_post(sender, instance, created, **kwargs):
+    # Отложенные записи объявит publish_scheduled в момент публикации.
+    if created and instance.publish_at is None:
+        posts_published.send(sender=Post, posts=[instance])
+
+
+@receiver(posts_published, sender=Post)
+def count_published_posts(sender, posts, **kwargs):
+    groups = Counter(
+        (post.group_id, post.author_id) for post in posts if post.group_id
+    )
+    for (group_id, author_id), total in groups.items():
+        refresh_group(group_id, author_id, total)
+    for author_id in {post.author_id for post in posts}:
+        forget_post_count(author_id)
+
+
+@receiver(posts_published, sender=Post)
+def update_group_trend(sender, posts, **kwargs):
+    for post in posts:
+        record_post(post)
+
+
+@receiver(post_save, sender=Post)
+def count_group_posts(sender, instance, created, **kwargs):
+    if 'group_id' not in instance.__dict__:
+        return
+    original = getattr(instance, '_original_group_id', None)
+    instance._original_group_id = instance.group_id
+    # Новые записи учитывает count_published_posts, а отложенные
+    # не входят в счётчик до публикации.
+    if created or instance.publish_at is not None:
+        return
+    if original == instance.group_id:
+        return
+    if original is not None:
+        refresh_group(original, instance.author_id, -1)
+    if instance.group_id is not None:
+        refresh_group(instance.group_id, instance.author_id, 1)
+
+
+@receiver(post_save, sender=Post)
+def save_revision(sender, instance, created, **kwargs):
+    if 'text' not in instance.__dict__:
+        return
+    original = getattr(instance, '_original_text', None)
+    if not created and original is not None and original != instance.text:
+        record_revision(instance, original)
+    instance._original_text = instance.text
+
+
+@receiver(post_delete, sender=Post)
+def uncount_group_post(sender, instance, **kwargs):
+    # Мягко удалённая запись уже вычтена из счётчика soft_delete_post,
+    # а отложенная в него ещё не входила.
+    if instance.group_id is None or instance.publish_at is not None:
+        return
+    if instance.deleted_at is None:
+        refresh_group(instance.group_id, instance.author_id, -1)
+
+
+@receiver(pre_save, sender=Post)
+def init_trend_score(sender, instance, **kwargs):
+    if instance._state.adding and not instance.trend_score:
+        reach = follower_count(instance.author_id)
+        instance.trend_score = hot_score(
+            post_activity(0, reach), instance.publish_at or timezone.now()
+        )
+
+
+@receiver(post_save, sender=Comment)
+def update_trend_score(sender, instance, created, **kwargs):
+    if created:
+        record_comment(instance.post)
+
+
+@receiver(post_delete, sender=Post)
+def reset_post_count_on_delete(sender, instance, **kwargs):
+    forget_post_count(instance.author_id)
+
+
+@receiver(posts_published, sender=Post)
+def count_unread(sender, posts, **kwargs):
+    authors = Counter(post.author_id for post in posts)
+
+    def notify():
+        for author_id, total in authors.items():
+            add_unread(author_id, total)
+
+    transaction.on_commit(notify)
+
+
+@receiver(posts_published, sender=Post)
+def publish_new_post(sender, posts, **kwargs):
+    ids = [post.id for post in posts]
+
+    def notify():
+        for post_id in ids:
+            publish('posts', {'id': post_id})
+
+    transaction.on_commit(notify)
+
+
+@receiver(post_save, sender=Comment)
+def publish_new_comment(sender, instance, created, **kwargs):
+    if created:
+        channel = f'post:{instance.post_id}:comments'
+        data = {
+            'id': instance.id,
+            'html': render_to_string(
+                'posts/includes/comment.html', {'comment': instance}
+            ),
+        }
+        transaction.on_commit(lambda: publish(channel, data))
+
+
+@receiver(followed, sender=Follow)
+def count_new_follows(sender, user, authors, **kwargs):
+    record_follows(user.pk, [author.pk for author in authors])
+
+
+@receiver(unfollowed, sender=Follow)
+def count_removed_follows(sender, user, authors, **kwargs):
+    change_follow_counts(user.pk, [author.pk for author in authors], -1)
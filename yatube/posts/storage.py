@@ -0,0 +1,65 @@
+import hashlib
+import os
+import posixpath
+import tempfile
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+TEMP_DIR = 'tmp'
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранит каждый файл один раз под SHA-256 его содержимого.
+
+    Хеш считается в том же проходе, в котором загрузка пишется во
+    временный файл; при совпадении хеша временный файл просто удаляется.
+    Ссылка на файл в StoredImage берётся до возврата имени.
+    Итоговое имя: posts/ab/cd/abcd....jpg.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        temp_dir = self.path(TEMP_DIR)
+        os.makedirs(temp_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        with tempfile.NamedTemporaryFile(dir=temp_dir, delete=False) as temp:
+            for chunk in content.chunks():
+                digest.update(chunk)
+                temp.write(chunk)
+        hexdigest = digest.hexdigest()
+        extension = os.path.splitext(name)[1].lower()
+        name = posixpath.join(
+            os.path.dirname(name),
+            hexdigest[:2],
+            hexdigest[2:4],
+            hexdigest + extension,
+        )
+        full_path = self.path(name)
+
+        def place_file(row_existed):
+            if row_existed and os.path.exists(full_path):
+                os.remove(temp.name)
+                return
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            os.replace(temp.name, full_path)
+            if settings.FILE_UPLOAD_PERMISSIONS is not None:
+                os.chmod(full_path, settings.FILE_UPLOAD_PERMISSIONS)
+
+        # posts.images импортирует это хранилище, поэтому импорт здесь.
+        from .images import reserve_image
+        try:
+            reserve_image(name, place_file)
+        except Exception:
+            if os.path.exists(temp.name):
+                os.remove(temp.name)
+            raise
+        return name
+
+
+content_addressed_storage = ContentAddressedStorage()
@@ -0,0 +1,163 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import (
+    Comment, Follow, Group, PendingUserDeletion, Post, StoredImage, User
+)
+
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x01\x00'
+    b'\x01\x00\x00\x00\x00\x21\xf9\x04'
+    b'\x01\x0a\x00\x01\x00\x2c\x00\x00'
+    b'\x00\x00\x01\x00\x01\x00\x00\x02'
+    b'\x02\x4c\x01\x00\x3b'
+)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class SoftDeleteTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='MikeyMouse')
+        self.reader = User.objects.create_user(username='JohnKennedy')
+        self.group = Group.objects.create(
+            title='Тестовая группа', slug='test-slug', description='Описание',
+        )
+        self.post = Post.objects.create(
+            author=self.author,
+            text='Пост',
+            group=self.group,
+            image=SimpleUploadedFile(
+                'small.gif', SMALL_GIF, content_type='image/gif'
+            ),
+        )
+        self.comment = Comment.objects.create(
+            post=self.post, author=self.reader, text='Комментарий'
+        )
+        Follow.objects.follow(self.reader, self.author)
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def purge(self):
+        call_command('purge_deleted', '--grace-hours=0', stdout=StringIO())
+
+    def test_post_delete_hides_post(self):
+        """Удалённая автором запись сразу пропадает со страниц."""
+        self.author_client.post(
+            reverse('posts:post_delete', kwargs={'post_id': self.post.id})
+        )
+        self.assertFalse(Post.objects.exists())
+        self.assertTrue(Post.all_objects.filter(pk=self.post.pk).exists())
+        self.assertFalse(self.author.posts.exists())
+        response = self.reader_client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id})
+        )
+        self.assertEqual(response.status_code, 404)
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.post_count, 0)
+
+    def test_only_author_deletes_post(self):
+        """Чужую запись удалить нельзя."""
+        response = self.reader_client.post(
+            reverse('posts:post_delete', kwargs={'post_id': self.post.id})
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(Post.objects.exists())
+
+    def test_comment_delete(self):
+        """Удалённый комментарий пропадает из поста."""
+        self.reader_client.post(reverse(
+            'posts:comment_delete', kwargs={'comment_id': self.comment.id}
+        ))
+        self.assertFalse(self.post.comments.exists())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 0)
+
+    @override_settings(EVENTS_ENABLED=True)
+    def test_comments_of_deleted_post_hidden(self):
+        """Комментарии и поток событий удалённой записи недоступны."""
+        self.author_client.post(
+            reverse('posts:post_delete', kwargs={'post_id': self.post.id})
+        )
+        for name in ('posts:post_comments', 'posts:comment_events'):
+            with self.subTest(name=name):
+                response = self.reader_client.get(
+                    reverse(name, kwargs={'post_id': self.post.id})
+                )
+                self.assertEqual(response.status_code, 404)
+
+    def test_post_author_deletes_comment(self):
+        """Автор записи видит кнопку и может удалить чужой комментарий,
+        посторонний получает 403.
+        """
+        url = reverse(
+            'posts:comment_delete', kwargs={'comment_id': self.comment.id}
+        )
+        stranger = User.objects.create_user(username='Stranger')
+        stranger_client = Client()
+        stranger_client.force_login(stranger)
+        self.assertEqual(stranger_client.post(url).status_code, 403)
+        self.assertTrue(self.post.comments.exists())
+        response = self.author_client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id})
+        )
+        self.assertContains(response, url)
+        self.author_client.post(url)
+        self.assertFalse(self.post.comments.exists())
+
+    def test_purge_deleted_post(self):
+        """Очистка удаляет запись, её комментарии и картинку."""
+        self.author_client.post(
+            reverse('posts:post_delete', kwargs={'post_id': self.post.id})
+        )
+        self.purge()
+        self.assertFalse(Post.all_objects.exists())
+        self.assertFalse(Comment.all_objects.exists())
+        self.assertFalse(StoredImage.objects.exists())
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.post_count, 0)
+
+    def test_purge_keeps_fresh_deletions(self):
+        """Записи моложе --grace-hours не удаляются."""
+        self.author_client.post(
+            reverse('posts:post_delete', kwargs={'post_id': self.post.id})
+        )
+        call_command('purge_deleted', stdout=StringIO())
+        self.assertTrue(Post.all_objects.exists())
+
+    def test_delete_user(self):
+        """Удаление пользователя мгновенно скрывает его данные, а
+        очистка удаляет их вместе с подписками.
+        """
+        call_command('delete_user', self.reader.username, stdout=StringIO())
+        self.reader.refresh_from_db()
+        self.assertFalse(self.reader.is_active)
+        self.assertFalse(Comment.objects.exists())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 0)
+        response = self.reader_client.get(reverse('posts:follow_index'))
+        self.assertEqual(response.status_code, 302)
+        self.purge()
+        self.assertFalse(User.objects.filter(pk=self.reader.pk).exists())
+        self.assertFalse(Follow.objects.exists())
+        self.assertFalse(Comment.all_objects.exists())
+        self.assertFalse(PendingUserDeletion.objects.exists())
+        self.assertTrue(Post.objects.exists())
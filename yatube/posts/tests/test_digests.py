@@ -0,0 +1,122 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from ..management.commands.send_digests import PERIOD_EPOCH
+from ..models import Digest, DigestRun, Follow, Post, User
+
+
+class DigestTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author_1 = User.objects.create_user(username='Author1')
+        cls.author_2 = User.objects.create_user(username='Author2')
+        cls.readers = [
+            User.objects.create_user(
+                username=f'Reader{i}', email=f'reader{i}@example.com'
+            )
+            for i in range(3)
+        ]
+        for reader in cls.readers:
+            Follow.objects.follow(reader, cls.author_1)
+        Follow.objects.follow(cls.readers[0], cls.author_2)
+        now = timezone.now()
+        period_end = now - (now - PERIOD_EPOCH) % timedelta(hours=24)
+        for author, text, age in (
+            (cls.author_1, 'Свежий пост', 1),
+            (cls.author_2, 'Ещё свежий пост', 2),
+            (cls.author_1, 'Старый пост', 30),
+        ):
+            post = Post.objects.create(author=author, text=text)
+            Post.objects.filter(pk=post.pk).update(
+                pub_date=period_end - timedelta(hours=age)
+            )
+
+    @staticmethod
+    def period_end():
+        now = timezone.now()
+        return now - (now - PERIOD_EPOCH) % timedelta(hours=24)
+
+    def run_digests(self, **options):
+        call_command(
+            'send_digests', '--chunk-size=1', stdout=StringIO(), **options
+        )
+
+    def test_one_digest_per_follower(self):
+        """Каждый подписчик получает один дайджест с записями периода."""
+        self.run_digests()
+        self.assertEqual(len(mail.outbox), 3)
+        by_recipient = {m.to[0]: m for m in mail.outbox}
+        first = by_recipient['reader0@example.com']
+        self.assertIn('Свежий пост', first.body)
+        self.assertIn('Ещё свежий пост', first.body)
+        self.assertNotIn('Старый пост', first.body)
+        self.assertNotIn(
+            'Ещё свежий пост', by_recipient['reader1@example.com'].body
+        )
+        self.assertEqual(
+            Digest.objects.get(user=self.readers[0]).post_count, 2
+        )
+
+    def test_finished_run_not_repeated(self):
+        """Повторный запуск за тот же период ничего не рассылает."""
+        self.run_digests()
+        self.run_digests()
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertIsNotNone(DigestRun.objects.get().finished)
+
+    def test_resume_after_failure(self):
+        """Прерванная рассылка продолжается без повторных писем."""
+        backend = 'django.core.mail.backends.locmem.EmailBackend'
+        original = mail.get_connection(backend).__class__.send_messages
+        calls = []
+
+        def flaky(connection, messages):
+            calls.append(messages)
+            if len(calls) == 2:
+                raise ConnectionError
+            return original(connection, messages)
+
+        with mock.patch(f'{backend}.send_messages', flaky):
+            with self.assertRaises(ConnectionError):
+                self.run_digests()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(Digest.objects.count(), 1)
+        self.run_digests()
+        self.assertEqual(
+            sorted(m.to[0] for m in mail.outbox),
+            [f'reader{i}@example.com' for i in range(3)],
+        )
+        self.assertEqual(Digest.objects.count(), 3)
+
+    def test_unfinished_run_resumed_next_period(self):
+        """Рассылка, прерванная до конца периода, дописывается при
+        следующем запуске, даже если период уже сменился.
+        """
+        current = DigestRun.objects.create(
+            period_end=self.period_end() - timedelta(hours=24),
+            last_user_id=self.readers[0].id,
+        )
+        self.run_digests()
+        current.refresh_from_db()
+        self.assertIsNotNone(current.finished)
+        self.assertEqual(DigestRun.objects.filter(finished=None).count(), 0)
+        self.assertEqual(
+            Digest.objects.filter(period_end=current.period_end).count(), 2
+        )
+
+    def test_inactive_users_skipped(self):
+        """Неактивные пользователи не получают дайджестов."""
+        User.objects.filter(pk=self.readers[1].pk).update(is_active=False)
+        self.run_digests()
+        self.assertEqual(
+            sorted(m.to[0] for m in mail.outbox),
+            ['reader0@example.com', 'reader2@example.com'],
+        )
+        self.assertFalse(Digest.objects.filter(user=self.readers[1]).exists())
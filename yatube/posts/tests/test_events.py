@@ -0,0 +1,99 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from core.events import get_bus
+
+from ..models import Comment, Post, User
+
+
+@override_settings(EVENTS_ENABLED=True, EVENTS_KEEPALIVE=0.01)
+class EventStreamTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='MikeyMouse')
+        self.post = Post.objects.create(author=self.user, text='Пост')
+        self.guest_client = Client()
+
+    def open_stream(self, url):
+        response = self.guest_client.get(url)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = iter(response.streaming_content)
+        self.assertEqual(next(stream), b'retry: 3000\n\n')
+        return response, stream
+
+    def next_event(self, stream):
+        for chunk in stream:
+            if not chunk.startswith(b':'):
+                return chunk.decode()
+
+    def test_pages_subscribe(self):
+        """Главная и страница записи открывают EventSource."""
+        for url in (
+            reverse('posts:index'),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id}),
+        ):
+            with self.subTest(url=url):
+                self.assertContains(self.guest_client.get(url), 'EventSource')
+
+    def test_connection_closed_before_streaming(self):
+        """Поток не держит соединение с БД, открытое при поиске записи."""
+        with mock.patch.object(connection, 'close') as close:
+            response, _ = self.open_stream(reverse(
+                'posts:comment_events', kwargs={'post_id': self.post.id}
+            ))
+            close.assert_called_once_with()
+        response.close()
+
+    def test_new_post_event(self):
+        """Новая запись приходит в поток главной страницы."""
+        response, stream = self.open_stream(reverse('posts:post_events'))
+        post = Post.objects.create(author=self.user, text='Новый пост')
+        self.assertEqual(
+            self.next_event(stream),
+            f'event: post\ndata: {{"id": {post.id}}}\n\n'
+        )
+        response.close()
+        self.assertEqual(get_bus()._subscriptions, {})
+
+    def test_new_comment_event(self):
+        """Новый комментарий приходит фрагментом HTML в поток поста."""
+        response, stream = self.open_stream(
+            reverse('posts:comment_events', kwargs={'post_id': self.post.id})
+        )
+        comment = Comment.objects.create(
+            post=self.post, author=self.user, text='Свежий комментарий'
+        )
+        event, data = self.next_event(stream).split('\n')[:2]
+        self.assertEqual(event, 'event: comment')
+        data = json.loads(data[len('data: '):])
+        self.assertEqual(data['id'], comment.id)
+        self.assertIn('Свежий комментарий', data['html'])
+        response.close()
+
+
+class EventsDisabledTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='MikeyMouse')
+        self.post = Post.objects.create(author=user, text='Пост')
+        self.guest_client = Client()
+
+    def test_endpoints_disabled(self):
+        """Без EVENTS_ENABLED потоков нет, страницы их не открывают."""
+        pages = {
+            reverse('posts:post_events'): reverse('posts:index'),
+            reverse(
+                'posts:comment_events', kwargs={'post_id': self.post.id}
+            ): reverse('posts:post_detail', kwargs={'post_id': self.post.id}),
+        }
+        for events_url, page_url in pages.items():
+            with self.subTest(url=events_url):
+                response = self.guest_client.get(events_url)
+                self.assertEqual(response.status_code, 404)
+                response = self.guest_client.get(page_url)
+                self.assertNotContains(response, 'EventSource')
@@ -0,0 +1,239 @@
+import threading
+import time
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..follow_stats import follower_count
+from ..models import (
+    Follow, FollowCounter, FollowSuggestion, User, followed, unfollowed
+)
+
+
+class FollowQuerySetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='MikeyMouse')
+        cls.author = User.objects.create_user(username='JohnKennedy')
+
+    def test_follow_is_idempotent(self):
+        """Повторная подписка не создаёт дубликат и не падает."""
+        self.assertTrue(Follow.objects.follow(self.user, self.author))
+        self.assertFalse(Follow.objects.follow(self.user, self.author))
+        self.assertEqual(Follow.objects.count(), 1)
+
+    def test_unfollow_is_idempotent(self):
+        """Повторная отписка ничего не удаляет."""
+        Follow.objects.follow(self.user, self.author)
+        self.assertTrue(Follow.objects.unfollow(self.user, self.author))
+        self.assertFalse(Follow.objects.unfollow(self.user, self.author))
+        self.assertFalse(Follow.objects.exists())
+
+    def test_signals_sent_only_on_change(self):
+        """Сигналы отправляются только при реальном изменении."""
+        events = []
+
+        def handler(signal, **kwargs):
+            events.append(signal)
+
+        followed.connect(handler)
+        unfollowed.connect(handler)
+        try:
+            Follow.objects.follow(self.user, self.author)
+            Follow.objects.follow(self.user, self.author)
+            Follow.objects.unfollow(self.user, self.author)
+            Follow.objects.unfollow(self.user, self.author)
+        finally:
+            followed.disconnect(handler)
+            unfollowed.disconnect(handler)
+        self.assertEqual(events, [followed, unfollowed])
+
+    def test_single_statement(self):
+        """Подписка и отписка выполняются одним запросом к таблице
+        подписок, без предварительного SELECT.
+        """
+        table = Follow._meta.db_table
+        for method in (Follow.objects.follow, Follow.objects.unfollow):
+            with self.subTest(method=method.__name__):
+                with CaptureQueriesContext(connection) as queries:
+                    method(self.user, self.author)
+                statements = [
+                    query['sql'] for query in queries.captured_queries
+                    if f'"{table}"' in query['sql']
+                ]
+                self.assertEqual(len(statements), 1)
+                self.assertFalse(statements[0].startswith('SELECT'))
+
+    def test_counters_updated(self):
+        """Счётчики подписчиков и подписок меняются вместе с подпиской."""
+        Follow.objects.follow(self.user, self.author)
+        Follow.objects.follow(self.user, self.author)
+        self.assertEqual(follower_count(self.author.pk), 1)
+        self.assertEqual(
+            FollowCounter.objects.get(pk=self.user.pk).following, 1
+        )
+        Follow.objects.unfollow(self.user, self.author)
+        Follow.objects.unfollow(self.user, self.author)
+        self.assertEqual(follower_count(self.author.pk), 0)
+        self.assertEqual(
+            FollowCounter.objects.get(pk=self.user.pk).following, 0
+        )
+
+
+def get_retrying_locked(client, url):
+    # SQLite в режиме shared cache сразу отвечает "table is locked"
+    # при конкурентной записи, такие запросы повторяем.
+    for _ in range(50):
+        try:
+            return client.get(url)
+        except OperationalError as error:
+            if 'locked' not in str(error):
+                raise
+            time.sleep(0.01)
+    raise AssertionError('База данных заблокирована')
+
+
+class FollowConcurrencyTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='MikeyMouse')
+        self.author = User.objects.create_user(username='JohnKennedy')
+        cache.clear()
+
+    def test_parallel_follow_requests(self):
+        """Параллельные запросы на подписку создают одну подписку
+        без ошибок IntegrityError.
+        """
+        url = reverse(
+            'posts:profile_follow',
+            kwargs={'username': self.author.username}
+        )
+        errors = []
+        barrier = threading.Barrier(8, timeout=10)
+        clients = []
+        for _ in range(8):
+            client = Client(raise_request_exception=True)
+            client.force_login(self.user)
+            clients.append(client)
+
+        def hammer(client):
+            try:
+                barrier.wait()
+                for _ in range(5):
+                    response = get_retrying_locked(client, url)
+                    if response.status_code != 302:
+                        errors.append(response.status_code)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=hammer, args=(client,))
+            for client in clients
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            Follow.objects.filter(user=self.user, author=self.author).count(),
+            1
+        )
+
+
+class FollowBatchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='MikeyMouse')
+        cls.authors = [
+            User.objects.create_user(username=f'Author{i}') for i in range(3)
+        ]
+
+    def setUp(self):
+        self.author_client = Client()
+        self.author_client.force_login(self.user)
+        cache.clear()
+
+    def test_batch_follow_and_unfollow(self):
+        """Пакетная подписка и отписка на нескольких авторов."""
+        url = reverse('posts:follow_batch')
+        usernames = [author.username for author in self.authors]
+        Follow.objects.follow(self.user, self.authors[0])
+        response = self.author_client.post(
+            url, {'authors': usernames + [self.user.username]}
+        )
+        self.assertEqual(response.json(), {'followed': 2})
+        self.assertEqual(self.user.follower.count(), 3)
+        self.assertEqual(self.user.follow_counter.following, 3)
+        response = self.author_client.post(
+            url, {'authors': usernames[:2], 'action': 'unfollow'}
+        )
+        self.assertEqual(response.json(), {'unfollowed': 2})
+        self.assertEqual(self.user.follower.count(), 1)
+        self.user.follow_counter.refresh_from_db()
+        self.assertEqual(self.user.follow_counter.following, 1)
+        self.assertEqual(
+            [follower_count(author.pk) for author in self.authors], [0, 0, 1]
+        )
+
+
+class FollowSuggestionTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user, cls.friend_1, cls.friend_2, cls.popular, cls.rare = [
+            User.objects.create_user(username=name)
+            for name in ('Mikey', 'Friend1', 'Friend2', 'Popular', 'Rare')
+        ]
+        for follower, author in (
+            (cls.user, cls.friend_1),
+            (cls.user, cls.friend_2),
+            (cls.friend_1, cls.popular),
+            (cls.friend_2, cls.popular),
+            (cls.friend_2, cls.rare),
+            (cls.friend_1, cls.user),
+        ):
+            Follow.objects.follow(follower, author)
+
+    def test_compute_suggestions(self):
+        """Рекомендации ранжируются по числу общих подписок и не
+        включают себя и уже отслеживаемых авторов.
+        """
+        call_command('compute_suggestions', stdout=StringIO())
+        suggestions = list(
+            FollowSuggestion.objects.filter(user=self.user)
+            .values_list('suggested__username', 'score')
+        )
+        self.assertEqual(suggestions, [('Popular', 2), ('Rare', 1)])
+
+    def test_follow_removes_suggestion(self):
+        """Подписка на рекомендованного автора убирает рекомендацию."""
+        call_command('compute_suggestions', stdout=StringIO())
+        Follow.objects.follow(self.user, self.popular)
+        self.assertEqual(
+            list(FollowSuggestion.objects.filter(user=self.user)
+                 .values_list('suggested__username', flat=True)),
+            ['Rare'],
+        )
+        Follow.objects.unfollow(self.user, self.popular)
+
+    def test_suggestions_on_own_profile(self):
+        """Свой профиль показывает рекомендации одним запросом."""
+        call_command('compute_suggestions', '--top=1', stdout=StringIO())
+        client = Client()
+        client.force_login(self.user)
+        response = client.get(
+            reverse('posts:profile', kwargs={'username': self.user.username})
+        )
+        self.assertEqual(
+            [s.suggested for s in response.context['suggestions']],
+            [self.popular]
+        )
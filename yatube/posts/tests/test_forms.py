@@ -1,3 +1,4 @@
+import hashlib
 import shutil
 import tempfile
 
@@ -134,4 +135,8 @@ class PostCreateFormTests(TestCase):
         self.assertEqual(post_with_image.text, form_data['text'])
         self.assertEqual(post_with_image.group.id, form_data['group'])
         self.assertEqual(post_with_image.author, form_data['author'])
-        self.assertEqual(post_with_image.image, 'posts/small.gif')
+        digest = hashlib.sha256(small_gif).hexdigest()
+        self.assertEqual(
+            post_with_image.image,
+            f'posts/{digest[:2]}/{digest[2:4]}/{digest}.gif'
+        )
@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+
+from ..models import Post, StoredImage, User
+
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class GarbageCollectMediaTests(TransactionTestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        user = User.objects.create_user(username='MikeyMouse')
+        self.post = Post.objects.create(
+            author=user,
+            text='Пост с картинкой',
+            image=SimpleUploadedFile('a.gif', b'GIF89a referenced'),
+        )
+        self.orphan = os.path.join(TEMP_MEDIA_ROOT, 'posts', 'old.gif')
+        with open(self.orphan, 'wb') as output:
+            output.write(b'GIF89a orphan')
+
+    def gc_media(self, *args):
+        output = StringIO()
+        call_command('gc_media', '--min-age=0', *args, stdout=output)
+        return output.getvalue()
+
+    def test_dry_run(self):
+        """В режиме dry run файлы только перечисляются."""
+        output = self.gc_media('--dry-run')
+        self.assertIn('posts/old.gif', output)
+        self.assertTrue(os.path.exists(self.orphan))
+
+    def test_orphans_deleted(self):
+        """Удаляются только файлы без ссылок из постов."""
+        self.gc_media()
+        self.assertFalse(os.path.exists(self.orphan))
+        self.assertTrue(os.path.exists(self.post.image.path))
+
+    def test_quarantine(self):
+        """Файлы без ссылок переносятся в карантин."""
+        quarantine = tempfile.mkdtemp(dir=TEMP_MEDIA_ROOT)
+        self.gc_media(f'--quarantine={quarantine}')
+        self.assertFalse(os.path.exists(self.orphan))
+        self.assertTrue(
+            os.path.exists(os.path.join(quarantine, 'posts', 'old.gif'))
+        )
+
+    def test_recent_files_skipped(self):
+        """Свежие файлы не трогаются, пока идёт загрузка."""
+        call_command('gc_media', stdout=StringIO())
+        self.assertTrue(os.path.exists(self.orphan))
+
+    def test_referenced_row_kept(self):
+        """Файл, на который уже взята ссылка, не удаляется."""
+        StoredImage.objects.create(name='posts/old.gif', ref_count=1)
+        output = self.gc_media()
+        self.assertTrue(os.path.exists(self.orphan))
+        self.assertIn('без ссылок: 0', output)
+
+    def test_abandoned_uploads_deleted(self):
+        """Временные файлы брошенных загрузок удаляются."""
+        temp_dir = os.path.join(TEMP_MEDIA_ROOT, 'tmp')
+        os.makedirs(temp_dir, exist_ok=True)
+        abandoned = os.path.join(temp_dir, 'tmpupload')
+        with open(abandoned, 'wb') as output:
+            output.write(b'GIF89a partial')
+        self.assertIn('tmp/tmpupload', self.gc_media('--dry-run'))
+        self.assertTrue(os.path.exists(abandoned))
+        call_command('gc_media', stdout=StringIO())
+        self.assertTrue(os.path.exists(abandoned))
+        self.gc_media()
+        self.assertFalse(os.path.exists(abandoned))
@@ -0,0 +1,74 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Group, Post, User
+
+
+class GroupStatsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user_1 = User.objects.create_user(username='MikeyMouse')
+        cls.user_2 = User.objects.create_user(username='JohnKennedy')
+        cls.group_1 = Group.objects.create(
+            title='Первая группа', slug='first', description='Описание',
+        )
+        cls.group_2 = Group.objects.create(
+            title='Вторая группа', slug='second', description='Описание',
+        )
+
+    def setUp(self):
+        self.author_client = Client()
+        self.author_client.force_login(self.user_1)
+        cache.clear()
+
+    def test_counters_follow_create_edit_delete(self):
+        """Счётчики группы меняются при создании, переносе и удалении."""
+        post = Post.objects.create(
+            author=self.user_1, text='Пост', group=self.group_1
+        )
+        self.group_1.refresh_from_db()
+        self.assertEqual(self.group_1.post_count, 1)
+        self.assertEqual(self.group_1.last_post_at, post.pub_date)
+        self.author_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.id}),
+            data={'text': post.text, 'group': self.group_2.id},
+        )
+        self.group_1.refresh_from_db()
+        self.group_2.refresh_from_db()
+        self.assertEqual(self.group_1.post_count, 0)
+        self.assertIsNone(self.group_1.last_post_at)
+        self.assertEqual(self.group_2.post_count, 1)
+        post.refresh_from_db()
+        post.delete()
+        self.group_2.refresh_from_db()
+        self.assertEqual(self.group_2.post_count, 0)
+
+    def test_group_index(self):
+        """Каталог групп показывает счётчики и активных авторов."""
+        Post.objects.create(author=self.user_1, text='1', group=self.group_1)
+        Post.objects.create(author=self.user_2, text='2', group=self.group_1)
+        Post.objects.create(author=self.user_2, text='3', group=self.group_1)
+        response = self.author_client.get(reverse('posts:group_index'))
+        groups = {group.slug: group for group in response.context['groups']}
+        self.assertEqual(groups['first'].post_count, 3)
+        self.assertEqual(
+            groups['first'].top_authors,
+            [('JohnKennedy', 2), ('MikeyMouse', 1)],
+        )
+        self.assertEqual(groups['second'].top_authors, [])
+
+    def test_top_authors_cached(self):
+        """Повторный запрос каталога не читает авторов заново, а новая
+        запись сбрасывает кеш только своей группы.
+        """
+        guest_client = Client()
+        guest_client.get(reverse('posts:group_index'))
+        with self.assertNumQueries(1):
+            guest_client.get(reverse('posts:group_index'))
+        Post.objects.create(author=self.user_1, text='1', group=self.group_2)
+        with self.assertNumQueries(2):
+            response = guest_client.get(reverse('posts:group_index'))
+        groups = {group.slug: group for group in response.context['groups']}
+        self.assertEqual(groups['second'].top_authors, [('MikeyMouse', 1)])
@@ -0,0 +1,123 @@
+import time
+
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Post, PostRevision, User
+from ..revisions import apply_delta, make_delta, revision_text
+
+
+class PostRevisionTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='MikeyMouse')
+
+    def setUp(self):
+        self.post = Post.objects.create(author=self.user, text='Версия 0')
+        self.author_client = Client()
+        self.author_client.force_login(self.user)
+
+    def edit(self, text):
+        self.author_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.id}),
+            data={'text': text},
+        )
+
+    def test_delta_roundtrip(self):
+        """Дельта восстанавливает новый текст из старого."""
+        old = 'Мама мыла раму. Папа читал газету.'
+        new = 'Мама мыла окно. Папа читал газету вслух.'
+        self.assertEqual(apply_delta(old, make_delta(old, new)), new)
+
+    def test_first_edit_keeps_original(self):
+        """Первая правка сохраняет исходный и новый тексты."""
+        self.assertFalse(self.post.revisions.exists())
+        self.edit('Версия 1')
+        self.assertEqual(revision_text(self.post, 1), 'Версия 0')
+        self.assertEqual(revision_text(self.post, 2), 'Версия 1')
+
+    def test_same_text_not_recorded(self):
+        """Сохранение без изменения текста не создаёт редакцию."""
+        self.edit(self.post.text)
+        self.assertFalse(self.post.revisions.exists())
+
+    @override_settings(POST_REVISION_SNAPSHOT_EVERY=3)
+    def test_any_revision_in_one_query(self):
+        """Любая редакция восстанавливается одним запросом, полный
+        текст хранится только в снимках.
+        """
+        for number in range(1, 8):
+            self.edit(f'Версия {number}')
+        self.assertEqual(
+            list(self.post.revisions.filter(is_snapshot=True)
+                 .values_list('number', flat=True)),
+            [1, 4, 7],
+        )
+        for number in range(1, 9):
+            with self.assertNumQueries(1):
+                text = revision_text(self.post, number)
+            self.assertEqual(text, f'Версия {number - 1}')
+        with self.assertRaises(PostRevision.DoesNotExist):
+            revision_text(self.post, 9)
+
+    def test_delta_is_compact(self):
+        """Мелкая правка длинного текста занимает мало места."""
+        text = 'Длинный текст записи. ' * 200
+        Post.objects.filter(pk=self.post.pk).update(text=text)
+        self.post.refresh_from_db()
+        self.edit(text + 'Дописано.')
+        delta = self.post.revisions.get(number=2)
+        self.assertLess(len(delta.data), 100)
+
+    def test_large_text_diffed_quickly(self):
+        """Дельта длинного текста считается быстро и восстанавливает
+        новый текст.
+        """
+        old = ' '.join(f'слово{number % 997}' for number in range(8000))
+        words = old.split(' ')
+        for number in range(0, len(words), 400):
+            words[number] = 'правка'
+        new = ' '.join(words)
+        started = time.perf_counter()
+        delta = make_delta(old, new)
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(apply_delta(old, delta), new)
+
+    @override_settings(POST_REVISION_DIFF_MAX_CHARS=100)
+    def test_long_text_stored_as_snapshot(self):
+        """Текст длиннее POST_REVISION_DIFF_MAX_CHARS хранится целиком."""
+        text = ' '.join(['Очень длинная версия.'] * 10)
+        self.edit('Версия 1')
+        self.edit(text)
+        revision = self.post.revisions.get(number=3)
+        self.assertTrue(revision.is_snapshot)
+        self.assertEqual(revision_text(self.post, 3), text)
+
+    def test_history_page(self):
+        """Страница истории показывает все редакции."""
+        self.edit('Версия 1')
+        response = self.author_client.get(
+            reverse('posts:post_history', kwargs={'post_id': self.post.id})
+        )
+        revisions = response.context['revisions']
+        self.assertEqual(
+            [revision['text'] for revision in revisions],
+            ['Версия 1', 'Версия 0'],
+        )
+
+    def test_history_only_for_author(self):
+        """Историю правок видит только автор записи."""
+        url = reverse('posts:post_history', kwargs={'post_id': self.post.id})
+        detail_url = reverse(
+            'posts:post_detail', kwargs={'post_id': self.post.id}
+        )
+        other = User.objects.create_user(username='JohnKennedy')
+        other_client = Client()
+        other_client.force_login(other)
+        self.assertRedirects(other_client.get(url), detail_url)
+        self.assertRedirects(
+            Client().get(url), f'{reverse("users:login")}?next={url}'
+        )
+        self.assertNotContains(other_client.get(detail_url), url)
+        self.assertContains(self.author_client.get(detail_url), url)
@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..author_stats import author_post_count
+from ..forms import DATETIME_LOCAL_FORMAT
+from ..models import Follow, Group, Post, UnreadCounter, User
+from ..scheduling import publish_due
+
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def frozen_clock(moment):
+    return mock.patch('django.utils.timezone.now', return_value=moment)
+
+
+class ScheduledPostTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='MikeyMouse')
+        self.reader = User.objects.create_user(username='JohnKennedy')
+        self.group = Group.objects.create(
+            title='Тестовая группа', slug='test-slug', description='Описание',
+        )
+        Follow.objects.follow(self.reader, self.author)
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+
+    def schedule(self, moment, text='Отложенный пост'):
+        with frozen_clock(NOW):
+            self.author_client.post(reverse('posts:post_create'), data={
+                'text': text,
+                'group': self.group.id,
+                'publish_at': moment.strftime(DATETIME_LOCAL_FORMAT),
+            })
+        return Post.all_objects.get(text=text)
+
+    def test_scheduled_post_hidden(self):
+        """Отложенная запись не видна в лентах и не учтена в счётчиках."""
+        post = self.schedule(NOW + timedelta(hours=1))
+        self.assertEqual(post.publish_at, NOW + timedelta(hours=1))
+        self.assertFalse(Post.objects.exists())
+        response = Client().get(
+            reverse('posts:post_detail', kwargs={'post_id': post.id})
+        )
+        self.assertEqual(response.status_code, 404)
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.post_count, 0)
+        self.assertFalse(UnreadCounter.objects.filter(count__gt=0).exists())
+        response = self.author_client.get(
+            reverse('posts:profile', kwargs={'username': self.author})
+        )
+        self.assertEqual(response.context['scheduled'], [post])
+
+    def test_past_time_rejected(self):
+        """Время публикации в прошлом не принимается."""
+        with frozen_clock(NOW):
+            response = self.author_client.post(
+                reverse('posts:post_create'),
+                data={
+                    'text': 'Пост',
+                    'publish_at': (NOW - timedelta(minutes=1))
+                    .strftime(DATETIME_LOCAL_FORMAT),
+                },
+            )
+        self.assertTrue(
+            response.context['schedule_form'].has_error('publish_at')
+        )
+        self.assertFalse(Post.all_objects.exists())
+
+    def test_published_when_due(self):
+        """Запись публикуется в своё время со всеми обновлениями."""
+        moment = NOW + timedelta(hours=1)
+        post = self.schedule(moment)
+        self.assertEqual(author_post_count(self.author.id), 0)
+        early = moment - timedelta(seconds=1)
+        self.assertEqual(publish_due(100, now=early), 0)
+        self.assertEqual(publish_due(100, now=moment), 1)
+        post.refresh_from_db()
+        self.assertIsNone(post.publish_at)
+        self.assertEqual(post.pub_date, moment)
+        self.assertEqual(list(Post.objects.all()), [post])
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.post_count, 1)
+        self.assertEqual(self.group.last_post_at, moment)
+        self.assertEqual(author_post_count(self.author.id), 1)
+        self.assertEqual(UnreadCounter.objects.get(user=self.reader).count, 1)
+
+    def test_published_in_batches(self):
+        """Планировщик публикует записи пачками до конца очереди."""
+        for number in range(3):
+            moment = NOW + timedelta(minutes=number + 1)
+            self.schedule(moment, f'Пост {number}')
+        later = NOW + timedelta(hours=1)
+        self.assertEqual(publish_due(2, now=later), 2)
+        self.assertEqual(Post.objects.count(), 2)
+        with frozen_clock(later):
+            call_command('publish_scheduled', '--batch-size=2',
+                         stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 3)
+        self.assertEqual(UnreadCounter.objects.get(user=self.reader).count, 3)
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.post_count, 3)
+
+    def test_reschedule(self):
+        """Отложенную запись можно перенести или опубликовать сразу."""
+        post = self.schedule(NOW + timedelta(hours=1))
+        url = reverse('posts:post_edit', kwargs={'post_id': post.id})
+        with frozen_clock(NOW):
+            self.author_client.post(url, data={
+                'text': post.text,
+                'publish_at': (NOW + timedelta(hours=2))
+                .strftime(DATETIME_LOCAL_FORMAT),
+            })
+        post.refresh_from_db()
+        self.assertEqual(post.publish_at, NOW + timedelta(hours=2))
+        with frozen_clock(NOW):
+            self.author_client.post(url, data={'text': post.text})
+            self.assertEqual(publish_due(100), 1)
+        self.assertTrue(Post.objects.filter(pk=post.pk).exists())
+
+    def test_deleted_scheduled_post(self):
+        """Удалённая отложенная запись не публикуется и не трогает
+        счётчик группы.
+        """
+        post = self.schedule(NOW + timedelta(hours=1))
+        self.author_client.post(
+            reverse('posts:post_delete', kwargs={'post_id': post.id})
+        )
+        self.assertEqual(publish_due(100, now=NOW + timedelta(days=1)), 0)
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.post_count, 0)
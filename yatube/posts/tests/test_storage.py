@@ -0,0 +1,151 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from ..models import Post, StoredImage, User
+
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x01\x00'
+    b'\x01\x00\x00\x00\x00\x21\xf9\x04'
+    b'\x01\x0a\x00\x01\x00\x2c\x00\x00'
+    b'\x00\x00\x01\x00\x01\x00\x00\x02'
+    b'\x02\x4c\x01\x00\x3b'
+)
+
+OTHER_GIF = SMALL_GIF.replace(b'\x4c\x01', b'\x44\x01')
+
+
+def upload(name, content=SMALL_GIF):
+    return SimpleUploadedFile(
+        name=name, content=content, content_type='image/gif'
+    )
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class ContentAddressedStorageTests(TransactionTestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='MikeyMouse')
+        self.author_client = Client()
+        self.author_client.force_login(self.user)
+
+    def create_post(self, image):
+        self.author_client.post(
+            reverse('posts:post_create'),
+            data={'text': 'Пост с картинкой', 'image': image},
+        )
+        return Post.objects.latest('id')
+
+    def test_duplicates_stored_once(self):
+        """Одинаковые картинки хранятся одним файлом с именем-хешем."""
+        post_1 = self.create_post(upload('first.gif'))
+        post_2 = self.create_post(upload('second.GIF'))
+        self.assertEqual(post_1.image.name, post_2.image.name)
+        self.assertRegex(
+            post_1.image.name,
+            r'^posts/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.gif$'
+        )
+        self.assertEqual(
+            StoredImage.objects.get(name=post_1.image.name).ref_count, 2
+        )
+
+    def test_replaced_image_released(self):
+        """Заменённая в post_edit картинка удаляется с диска."""
+        post = self.create_post(upload('first.gif'))
+        old_name, old_path = post.image.name, post.image.path
+        self.author_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.id}),
+            data={'text': post.text, 'image': upload('other.gif', OTHER_GIF)},
+        )
+        post.refresh_from_db()
+        self.assertNotEqual(post.image.path, old_path)
+        self.assertFalse(os.path.exists(old_path))
+        self.assertTrue(os.path.exists(post.image.path))
+        self.assertFalse(StoredImage.objects.filter(name=old_name).exists())
+
+    def test_file_kept_while_referenced(self):
+        """Файл удаляется только вместе с последним постом."""
+        post_1 = self.create_post(upload('first.gif'))
+        post_2 = self.create_post(upload('second.gif'))
+        path = post_1.image.path
+        post_1.delete()
+        self.assertTrue(os.path.exists(path))
+        post_2.delete()
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(StoredImage.objects.exists())
+
+    def test_duplicate_reserved_before_post_saved(self):
+        """Ссылка на существующий файл берётся ещё при загрузке: удаление
+        последнего поста до сохранения нового файл не стирает.
+        """
+        post_1 = self.create_post(upload('first.gif'))
+        path = post_1.image.path
+        name = post_1.image.storage.save('posts/second.gif', upload('x.gif'))
+        self.assertEqual(name, post_1.image.name)
+        post_1.delete()
+        self.assertTrue(os.path.exists(path))
+        Post.objects.create(author=self.user, text='Тот же файл', image=name)
+        self.assertEqual(StoredImage.objects.get(name=name).ref_count, 1)
+
+    def test_missing_row_rewrites_file(self):
+        """Если строки StoredImage уже нет, файл записывается заново."""
+        post = self.create_post(upload('first.gif'))
+        path = post.image.path
+        post.delete()
+        self.assertFalse(os.path.exists(path))
+        name = post.image.storage.save('posts/again.gif', upload('again.gif'))
+        self.assertTrue(os.path.exists(path))
+        Post.objects.create(author=self.user, text='Снова', image=name)
+        self.assertEqual(StoredImage.objects.get(name=name).ref_count, 1)
+
+    def test_same_image_reuploaded_on_edit(self):
+        """Повторная загрузка той же картинки при правке не оставляет
+        лишней ссылки: файл удаляется вместе с постом.
+        """
+        post = self.create_post(upload('first.gif'))
+        path = post.image.path
+        self.author_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.id}),
+            data={'text': 'Правка', 'image': upload('again.gif')},
+        )
+        self.assertEqual(
+            StoredImage.objects.get(name=post.image.name).ref_count, 1
+        )
+        Post.all_objects.filter(id=post.id).delete()
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(StoredImage.objects.exists())
+
+    def test_unused_reservation_released(self):
+        """Резерв, который не забрал ни один пост, возвращается в конце
+        запроса.
+        """
+        post = self.create_post(upload('first.gif'))
+        post.image.storage.save('posts/second.gif', upload('second.gif'))
+        self.author_client.get(reverse('posts:index'))
+        self.assertEqual(
+            StoredImage.objects.get(name=post.image.name).ref_count, 1
+        )
+
+    def test_temp_file_removed_on_error(self):
+        """Если ссылку взять не удалось, временный файл удаляется."""
+        storage = Post._meta.get_field('image').storage
+        with mock.patch(
+            'posts.images.reserve_image', side_effect=DatabaseError
+        ):
+            with self.assertRaises(DatabaseError):
+                storage.save('posts/first.gif', upload('first.gif'))
+        self.assertEqual(os.listdir(storage.path('tmp')), [])
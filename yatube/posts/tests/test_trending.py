@@ -0,0 +1,105 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Comment, Follow, Group, Post, User
+
+
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='MikeyMouse')
+        cls.reader = User.objects.create_user(username='JohnKennedy')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.quiet_post = Post.objects.create(
+            author=cls.user, text='Тихий пост'
+        )
+        cls.hot_post = Post.objects.create(
+            author=cls.user, text='Обсуждаемый пост', group=cls.group
+        )
+        Post.objects.filter(pk=cls.hot_post.pk).update(
+            pub_date=cls.quiet_post.pub_date,
+            trend_score=cls.quiet_post.trend_score,
+        )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.reader)
+        cache.clear()
+
+    def comment(self, post, times=1):
+        for _ in range(times):
+            self.authorized_client.post(
+                reverse('posts:add_comment', kwargs={'post_id': post.id}),
+                data={'text': 'Комментарий'},
+            )
+
+    def test_new_post_scored(self):
+        """Новая запись сразу получает оценку по времени публикации."""
+        self.assertGreater(self.quiet_post.trend_score, 0)
+
+    def test_comment_updates_scores(self):
+        """Комментарий повышает оценку записи и её группы."""
+        self.comment(self.hot_post, times=3)
+        self.hot_post.refresh_from_db()
+        self.group.refresh_from_db()
+        self.assertEqual(self.hot_post.comment_count, 3)
+        self.assertGreater(
+            self.hot_post.trend_score, self.quiet_post.trend_score
+        )
+        self.assertEqual(self.group.activity, 3)
+        self.assertGreater(self.group.trend_score, 0)
+
+    def test_trending_page_order(self):
+        """Лента популярного отсортирована по оценке."""
+        self.comment(self.hot_post)
+        response = self.authorized_client.get(reverse('posts:trending'))
+        self.assertEqual(
+            list(response.context['page_obj']),
+            [self.hot_post, self.quiet_post],
+        )
+        self.assertEqual(list(response.context['groups']), [self.group])
+
+    def test_compute_trending(self):
+        """Пакетный пересчёт учитывает комментарии и охват автора."""
+        Comment.objects.bulk_create([
+            Comment(post=self.quiet_post, author=self.reader, text='Текст')
+            for _ in range(2)
+        ])
+        Follow.objects.follow(self.reader, self.user)
+        call_command('compute_trending', stdout=StringIO())
+        self.quiet_post.refresh_from_db()
+        self.hot_post.refresh_from_db()
+        self.group.refresh_from_db()
+        self.assertEqual(self.quiet_post.comment_count, 2)
+        self.assertGreater(
+            self.quiet_post.trend_score, self.hot_post.trend_score
+        )
+        self.assertAlmostEqual(self.group.activity, 0.1)
+
+    def test_incremental_matches_batch(self):
+        """Инкрементальные оценки совпадают с пакетным пересчётом."""
+        Follow.objects.follow(self.reader, self.user)
+        post = Post.objects.create(
+            author=self.user, text='Новый пост', group=self.group
+        )
+        self.comment(post, times=2)
+        post.refresh_from_db()
+        self.group.refresh_from_db()
+        incremental = (post.trend_score, self.group.activity)
+        # hot_post опубликован до подписки, с нулевым охватом; пакетный
+        # пересчёт учёл бы текущий охват, поэтому убираем его из группы.
+        Post.objects.filter(pk=self.hot_post.pk).update(group=None)
+        call_command('compute_trending', stdout=StringIO())
+        post.refresh_from_db()
+        self.group.refresh_from_db()
+        self.assertAlmostEqual(post.trend_score, incremental[0])
+        self.assertAlmostEqual(self.group.activity, incremental[1])
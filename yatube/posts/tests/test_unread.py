@@ -0,0 +1,67 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Follow, UnreadCounter, User
+
+
+class UnreadCounterTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='MikeyMouse')
+        self.reader = User.objects.create_user(username='JohnKennedy')
+        self.stranger = User.objects.create_user(username='Stranger')
+        Follow.objects.follow(self.reader, self.author)
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def create_posts(self, count):
+        for number in range(count):
+            self.author_client.post(
+                reverse('posts:post_create'), {'text': f'Пост {number}'}
+            )
+
+    def test_new_posts_counted_for_followers(self):
+        """Новые записи увеличивают счётчик только подписчиков."""
+        self.create_posts(2)
+        self.assertEqual(UnreadCounter.objects.get(user=self.reader).count, 2)
+        self.assertFalse(
+            UnreadCounter.objects.filter(user=self.stranger).exists()
+        )
+        response = self.reader_client.get(reverse('posts:index'))
+        self.assertEqual(response.context['unread_count'], 2)
+
+    def test_counter_read_from_cache(self):
+        """Счётчик в шапке читается из кеша без запросов к БД."""
+        self.create_posts(1)
+        self.reader_client.get(reverse('about:author'))
+        with self.assertNumQueries(0):
+            response = self.reader_client.get(reverse('about:author'))
+        self.assertContains(response, 'badge')
+
+    def test_feed_resets_counter(self):
+        """Открытие ленты сбрасывает счётчик."""
+        self.create_posts(3)
+        response = self.reader_client.get(reverse('posts:follow_index'))
+        self.assertEqual(response.context['unread_count'], 0)
+        self.assertEqual(UnreadCounter.objects.get(user=self.reader).count, 0)
+        cache.clear()
+        response = self.reader_client.get(reverse('about:author'))
+        self.assertNotContains(response, 'badge')
+
+    def test_zero_counter_not_written(self):
+        """Уже обнулённый счётчик при листании ленты не перезаписывается."""
+        self.create_posts(11)
+        self.reader_client.get(reverse('posts:follow_index'))
+        with CaptureQueriesContext(connection) as queries:
+            self.reader_client.get(
+                reverse('posts:follow_index'), {'page': 2}
+            )
+        self.assertFalse([
+            query for query in queries
+            if query['sql'].startswith('UPDATE')
+        ])
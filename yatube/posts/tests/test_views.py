@@ -390,3 +390,142 @@ class PostViewsTests(TestCase):
         self.assertEqual(new_post, new_post_follow_1)
         new_post_follow_2 = response_2.context['page_obj'].object_list
         self.assertFalse(new_post_follow_2)
+
+
+class CommentPaginationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='MikeyMouse')
+        cls.post = Post.objects.create(author=cls.user, text='Тестовый пост')
+        Comment.objects.bulk_create(
+            Comment(post=cls.post, author=cls.user, text=f'Комментарий {i}')
+            for i in range(25)
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_post_detail_first_page(self):
+        """На странице поста выводится только первая страница
+        комментариев и курсор для загрузки следующей.
+        """
+        response = self.guest_client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id})
+        )
+        self.assertEqual(len(response.context['comments']), 20)
+        self.assertIsNotNone(response.context['next_cursor'])
+
+    def test_load_more_comments(self):
+        """JSON-эндпоинт отдаёт оставшиеся комментарии без повторов."""
+        url = reverse('posts:post_comments', kwargs={'post_id': self.post.id})
+        first = self.guest_client.get(url).json()
+        second = self.guest_client.get(url, {'cursor': first['next']}).json()
+        ids = [c['id'] for c in first['comments'] + second['comments']]
+        self.assertEqual(len(second['comments']), 5)
+        self.assertIsNone(second['next'])
+        self.assertEqual(
+            sorted(ids),
+            sorted(Comment.objects.values_list('id', flat=True))
+        )
+        self.assertIn('Комментарий', first['comments'][0]['html'])
+
+    def test_bad_cursor(self):
+        """Испорченный курсор даёт 404."""
+        response = self.guest_client.get(
+            reverse('posts:post_comments', kwargs={'post_id': self.post.id}),
+            {'cursor': 'broken'}
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class ProfileQueriesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='MikeyMouse')
+        cls.reader = User.objects.create_user(username='JohnKennedy')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            [
+                Post(author=cls.author, text='Пост', group=cls.group)
+                for _ in range(15)
+            ]
+        )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+        cls.url = reverse(
+            'posts:profile', kwargs={'username': cls.author.username}
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.reader)
+
+    def test_guest_queries(self):
+        """Профиль для гостя: сводка автора и страница записей."""
+        with self.assertNumQueries(2):
+            response = self.guest_client.get(self.url)
+        self.assertEqual(response.context['posts_counter'], 15)
+        self.assertFalse(response.context['following'])
+        self.assertEqual(len(response.context['page_obj']), 10)
+        self.assertEqual(response.context['page_obj'].paginator.num_pages, 2)
+
+    def test_follower_queries(self):
+        """Подписка проверяется в том же запросе, что и сводка автора."""
+        self.authorized_client.get(self.url)
+        with self.assertNumQueries(2):
+            response = self.authorized_client.get(self.url)
+        self.assertTrue(response.context['following'])
+        self.assertEqual(response.context['posts_counter'], 15)
+
+
+class PostDetailQueriesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='MikeyMouse')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.author, text='Пост', group=cls.group
+        )
+        Comment.objects.bulk_create([
+            Comment(post=cls.post, author=cls.author, text='Комментарий')
+            for _ in range(3)
+        ])
+        cls.url = reverse(
+            'posts:post_detail', kwargs={'post_id': cls.post.id}
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+        cache.clear()
+
+    def test_queries(self):
+        """Пост с автором и группой, комментарии с авторами и счётчик
+        записей автора из кеша.
+        """
+        with self.assertNumQueries(3):
+            self.guest_client.get(self.url)
+        with self.assertNumQueries(2):
+            response = self.guest_client.get(self.url)
+        self.assertEqual(response.context['posts_counter'], 1)
+        self.assertEqual(len(response.context['comments']), 3)
+
+    def test_post_count_invalidated(self):
+        """Новая и удалённая запись сбрасывают кешированный счётчик."""
+        self.guest_client.get(self.url)
+        new_post = Post.objects.create(author=self.author, text='Ещё')
+        response = self.guest_client.get(self.url)
+        self.assertEqual(response.context['posts_counter'], 2)
+        new_post.delete()
+        response = self.guest_client.get(self.url)
+        self.assertEqual(response.context['posts_counter'], 1)
@@ -0,0 +1,88 @@
+import math
+from datetime import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .follow_stats import follower_count
+from .models import Group, Post
+
+
+TRENDING_EPOCH = datetime(2022, 1, 1, tzinfo=timezone.utc)
+
+
+def hot_score(activity, moment):
+    """Логарифм активности плюс время, прошедшее от TRENDING_EPOCH.
+
+    Чтобы удержаться рядом с записью, опубликованной на
+    TRENDING_DECAY_SECONDS позже, нужно в десять раз больше активности.
+    Оценка не меняется с течением времени, поэтому хранится в
+    индексированном столбце, и лента читается простым ORDER BY.
+    """
+    age = (moment - TRENDING_EPOCH).total_seconds()
+    return (
+        math.log10(max(activity, 1))
+        + age / settings.TRENDING_DECAY_SECONDS
+    )
+
+
+def post_activity(comment_count, reach):
+    """Активность записи: комментарии и охват подписчиков автора."""
+    return (
+        comment_count * settings.TRENDING_COMMENT_WEIGHT
+        + reach * settings.TRENDING_REACH_WEIGHT
+    )
+
+
+def _rescore_group(group_id, moment):
+    activity = Group.objects.filter(pk=group_id).values_list(
+        'activity', flat=True
+    ).get()
+    Group.objects.filter(pk=group_id).update(
+        trend_score=hot_score(activity, moment)
+    )
+
+
+def record_post(post):
+    """Добавляет активность опубликованной записи к её группе.
+
+    Активность группы — сумма post_activity её записей, как и в
+    compute_trending: при публикации прибавляется охват, при каждом
+    комментарии — вес комментария.
+    """
+    if post.group_id is None:
+        return
+    activity = post_activity(0, follower_count(post.author_id))
+    with transaction.atomic():
+        Group.objects.filter(pk=post.group_id).update(
+            activity=F('activity') + activity
+        )
+        _rescore_group(post.group_id, post.pub_date)
+
+
+def record_comment(post):
+    """Инкрементально обновляет оценки записи и её группы."""
+    with transaction.atomic():
+        Post.objects.filter(pk=post.pk).update(
+            comment_count=F('comment_count') + 1
+        )
+        if post.group_id:
+            Group.objects.filter(pk=post.group_id).update(
+                activity=F('activity') + post_activity(1, 0)
+            )
+        row = (
+            Post.objects.filter(pk=post.pk)
+            .values(
+                'comment_count', 'pub_date',
+                'author__follow_counter__followers',
+            )
+            .get()
+        )
+        reach = row['author__follow_counter__followers'] or 0
+        Post.objects.filter(pk=post.pk).update(trend_score=hot_score(
+            post_activity(row['comment_count'], reach), row['pub_date']
+        ))
+        if post.group_id:
+            _rescore_group(post.group_id, timezone.now())
@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.db.models import F
+
+from .models import Follow, UnreadCounter
+
+
+UNREAD_CACHE_KEY = 'unread:{}'
+
+UNREAD_TIMEOUT = 24 * 60 * 60
+
+
+def unread_count(user_id):
+    """Число непрочитанных записей ленты: из кеша или одним чтением
+    строки счётчика по первичному ключу.
+    """
+    key = UNREAD_CACHE_KEY.format(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = UnreadCounter.objects.filter(user_id=user_id).values_list(
+            'count', flat=True
+        ).first() or 0
+        cache.set(key, count, UNREAD_TIMEOUT)
+    return count
+
+
+def add_unread(author_id, count=1):
+    """Увеличивает счётчики всех подписчиков автора одним UPDATE.
+
+    Строки счётчиков создаются только для новых подписчиков, которых
+    находит один anti-join.
+    """
+    followers = Follow.objects.filter(author_id=author_id).values('user_id')
+    missing = followers.exclude(
+        user_id__in=UnreadCounter.objects.values('user_id')
+    ).values_list('user_id', flat=True)
+    UnreadCounter.objects.bulk_create(
+        [UnreadCounter(user_id=user_id) for user_id in missing],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    UnreadCounter.objects.filter(user_id__in=followers).update(
+        count=F('count') + count
+    )
+    cache.delete_many([
+        UNREAD_CACHE_KEY.format(user_id)
+        for user_id in followers.values_list('user_id', flat=True)
+    ])
+
+
+def reset_unread(user_id):
+    """Обнуляет счётчик. Лента открывается заново при каждом переходе
+    по страницам, поэтому уже нулевой счётчик (по кешу) не пишется.
+    """
+    if not unread_count(user_id):
+        return
+    UnreadCounter.objects.filter(user_id=user_id, count__gt=0).update(count=0)
+    cache.set(UNREAD_CACHE_KEY.format(user_id), 0, UNREAD_TIMEOUT)
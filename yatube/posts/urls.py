@@ -7,16 +7,40 @@ app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('trending/', views.trending, name='trending'),
+    path('events/posts/', views.post_events, name='post_events'),
+    path('group/', views.group_index, name='group_index'),
     path('group/<slug:slug>/', views.group_posts, name='group_posts'),
     path('profile/<str:username>/', views.profile, name='profile'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
+    path('posts/<int:post_id>/history/',
+         views.post_history,
+         name='post_history'
+         ),
+    path('posts/<int:post_id>/delete/',
+         views.post_delete,
+         name='post_delete'
+         ),
     path('create/', views.post_create, name='post_create'),
     path('posts/<int:post_id>/comment/',
          views.add_comment,
          name='add_comment'
          ),
+    path('posts/<int:post_id>/comments/',
+         views.post_comments,
+         name='post_comments'
+         ),
+    path('posts/<int:post_id>/events/',
+         views.comment_events,
+         name='comment_events'
+         ),
+    path('comments/<int:comment_id>/delete/',
+         views.comment_delete,
+         name='comment_delete'
+         ),
     path('follow/', views.follow_index, name='follow_index'),
+    path('follow/batch/', views.follow_batch, name='follow_batch'),
     path('profile/<str:username>/follow/',
          views.profile_follow,
          name='profile_follow'
@@ -1,33 +1,152 @@
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
 from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import (
+    Count, Exists, IntegerField, OuterRef, Q, Subquery
+)
+from django.db.models.functions import Coalesce
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
+from django.template.loader import render_to_string
+from django.utils.dateparse import parse_datetime
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.cache import cache_page
+from django.views.decorators.http import require_POST
 
-from .models import Post, Group, User, Follow
-from .forms import PostForm, CommentForm
+from core.events import event_stream
+from core.ratelimit import ratelimit
+
+from .models import Post, Group, User, Follow, Comment, FollowSuggestion
+from .forms import CommentForm, PostForm, PostScheduleForm
+from .author_stats import author_post_count
+from .deletion import soft_delete_comment, soft_delete_post
+from .group_stats import top_authors
+from .revisions import revision_history
+from .unread import reset_unread
 
 
 NUMBER_OF_POSTS: int = 10
 
+NUMBER_OF_COMMENTS: int = 20
+
+NUMBER_OF_SUGGESTIONS: int = 5
+
+BATCH_FOLLOW_LIMIT: int = 100
+
+NUMBER_OF_TRENDING_GROUPS: int = 5
+
 
-def paginator(request, post_list):
+def forms_valid(*forms):
+    """Проверяет все формы (чтобы у каждой были ошибки), пропуская None."""
+    return all([form.is_valid() for form in forms if form is not None])
+
+
+def paginator(request, post_list, count=None):
     pagin = Paginator(post_list, NUMBER_OF_POSTS)
+    if count is not None:
+        pagin.count = count
     page_number = request.GET.get('page')
     page_obj = pagin.get_page(page_number)
     return page_obj
 
 
+def event_response(channel, event):
+    # Иначе соединение с БД закрылось бы только по request_finished, то
+    # есть вместе с потоком, до EVENTS_MAX_DURATION спустя.
+    if not connection.in_atomic_block:
+        connection.close()
+    response = StreamingHttpResponse(
+        event_stream(channel, event), content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def encode_cursor(comment):
+    value = f'{comment.created.isoformat()}|{comment.id}'
+    return urlsafe_base64_encode(value.encode())
+
+
+def decode_cursor(cursor):
+    try:
+        created, comment_id = (
+            urlsafe_base64_decode(cursor).decode().split('|')
+        )
+        created = parse_datetime(created)
+        comment_id = int(comment_id)
+    except ValueError:
+        raise Http404
+    if created is None:
+        raise Http404
+    return created, comment_id
+
+
+def comments_page(post_id, cursor=None):
+    """Страница комментариев по ключу (created, id) и курсор следующей."""
+    comments = (
+        Comment.objects.filter(post_id=post_id)
+        .select_related('author', 'post')
+        .order_by('-created', '-id')
+    )
+    if cursor:
+        created, comment_id = decode_cursor(cursor)
+        comments = comments.filter(
+            Q(created__lt=created) | Q(created=created, id__lt=comment_id)
+        )
+    comments = list(comments[:NUMBER_OF_COMMENTS + 1])
+    next_cursor = None
+    if len(comments) > NUMBER_OF_COMMENTS:
+        comments = comments[:NUMBER_OF_COMMENTS]
+        next_cursor = encode_cursor(comments[-1])
+    return comments, next_cursor
+
+
 @cache_page(20, key_prefix='index_page')
 def index(request):
     post_list = Post.objects.all()
     page_obj = paginator(request, post_list)
     context = {
         'page_obj': page_obj,
+        'events_enabled': settings.EVENTS_ENABLED,
     }
     template = 'posts/index.html'
     return render(request, template, context)
 
 
+@cache_page(60, key_prefix='trending_page')
+def trending(request):
+    post_list = Post.objects.select_related('author', 'group').order_by(
+        '-trend_score'
+    )
+    page_obj = paginator(request, post_list)
+    groups = Group.objects.filter(trend_score__gt=0).order_by(
+        '-trend_score'
+    )[:NUMBER_OF_TRENDING_GROUPS]
+    context = {
+        'page_obj': page_obj,
+        'groups': groups,
+    }
+    template = 'posts/trending.html'
+    return render(request, template, context)
+
+
+def group_index(request):
+    groups = list(Group.objects.only(
+        'title', 'slug', 'post_count', 'last_post_at'
+    ))
+    authors = top_authors([group.id for group in groups])
+    for group in groups:
+        group.top_authors = authors.get(group.id, [])
+    context = {
+        'groups': groups,
+    }
+    template = 'posts/group_index.html'
+    return render(request, template, context)
+
+
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
     post_list = group.posts.all()
@@ -40,32 +159,66 @@ def group_posts(request, slug):
     return render(request, template, context)
 
 
+def profile_summary(request, username):
+    """Автор, число его записей и подписка на него одним запросом."""
+    post_count = (
+        Post.objects.filter(author=OuterRef('pk'))
+        .order_by()
+        .values('author')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    authors = User.objects.annotate(
+        posts_counter=Coalesce(
+            Subquery(post_count, output_field=IntegerField()), 0
+        )
+    )
+    if request.user.is_authenticated:
+        authors = authors.annotate(is_followed=Exists(
+            Follow.objects.filter(user=request.user, author=OuterRef('pk'))
+        ))
+    return get_object_or_404(authors, username=username)
+
+
 def profile(request, username):
-    prof_author = get_object_or_404(User, username=username)
-    posts_counter = prof_author.posts.count()
-    post_list = prof_author.posts.all()
-    page_obj = paginator(request, post_list)
-    following = Follow.objects.filter(
-        user=request.user.id,
-        author=prof_author.id
-    ).exists()
+    prof_author = profile_summary(request, username)
+    page_obj = paginator(
+        request,
+        prof_author.posts.select_related('group'),
+        count=prof_author.posts_counter,
+    )
+    suggestions = scheduled = None
+    if request.user == prof_author:
+        suggestions = list(
+            FollowSuggestion.objects.filter(user=request.user)
+            .select_related('suggested')[:NUMBER_OF_SUGGESTIONS]
+        )
+        scheduled = list(
+            Post.all_objects.alive()
+            .filter(author=prof_author, publish_at__isnull=False)
+            .order_by('publish_at')
+        )
     context = {
         'prof_author': prof_author,
-        'posts_counter': posts_counter,
+        'posts_counter': prof_author.posts_counter,
         'page_obj': page_obj,
-        'following': following,
+        'following': getattr(prof_author, 'is_followed', False),
+        'suggestions': suggestions,
+        'scheduled': scheduled,
     }
     template = 'posts/profile.html'
     return render(request, template, context)
 
 
 def post_detail(request, post_id):
-    one_post = get_object_or_404(Post, id=post_id)
+    one_post = get_object_or_404(
+        Post.objects.select_related('author', 'group'), id=post_id
+    )
     one_post_author = one_post.author
-    posts_counter = one_post_author.posts.count()
+    posts_counter = author_post_count(one_post_author.id)
     group_name = one_post.group
     form = CommentForm()
-    comments = one_post.comments.filter(post=post_id)
+    comments, next_cursor = comments_page(post_id)
     template = 'posts/post_detail.html'
     context = {
         'one_post': one_post,
@@ -75,19 +228,60 @@ def post_detail(request, post_id):
         'post_id': post_id,
         'form': form,
         'comments': comments,
+        'next_cursor': next_cursor,
+        'events_enabled': settings.EVENTS_ENABLED,
     }
     return render(request, template, context)
 
 
+def post_comments(request, post_id):
+    get_object_or_404(Post, id=post_id)
+    comments, next_cursor = comments_page(
+        post_id, request.GET.get('cursor')
+    )
+    return JsonResponse({
+        'comments': [
+            {
+                'id': comment.id,
+                'html': render_to_string(
+                    'posts/includes/comment.html',
+                    {'comment': comment},
+                    request,
+                ),
+            }
+            for comment in comments
+        ],
+        'next': next_cursor,
+    })
+
+
+def post_events(request):
+    if not settings.EVENTS_ENABLED:
+        raise Http404
+    return event_response('posts', 'post')
+
+
+def comment_events(request, post_id):
+    if not settings.EVENTS_ENABLED:
+        raise Http404
+    get_object_or_404(Post, id=post_id)
+    return event_response(f'post:{post_id}:comments', 'comment')
+
+
 @login_required
+@ratelimit('post_create')
 def post_create(request):
     form = PostForm(request.POST or None, files=request.FILES or None)
+    schedule_form = PostScheduleForm(
+        request.POST or None, instance=form.instance
+    )
     author = request.user
     template = 'posts/create_post.html'
     context = {
         'form': form,
+        'schedule_form': schedule_form,
     }
-    if not form.is_valid():
+    if not forms_valid(form, schedule_form):
         return render(request, template, context)
     post = form.save(commit=False)
     post.author = author
@@ -97,26 +291,59 @@ def post_create(request):
 
 @login_required
 def post_edit(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    post = get_object_or_404(Post.all_objects.alive(), id=post_id)
     form = PostForm(
         request.POST or None,
         files=request.FILES or None,
         instance=post)
+    schedule_form = None
+    if post.publish_at is not None:
+        schedule_form = PostScheduleForm(request.POST or None, instance=post)
     if post.author != request.user:
         return redirect('posts:post_detail', post_id)
-    if form.is_valid():
-        form.save()
+    if forms_valid(form, schedule_form):
+        post = form.save()
+        if post.publish_at is not None:
+            return redirect('posts:profile', request.user.username)
         return redirect('posts:post_detail', post_id)
     is_edit = True
     template = 'posts/create_post.html'
     context = {
         'form': form,
+        'schedule_form': schedule_form,
         'is_edit': is_edit,
     }
     return render(request, template, context)
 
 
 @login_required
+def post_history(request, post_id):
+    post = get_object_or_404(
+        Post.objects.select_related('author'), id=post_id
+    )
+    # В истории остаётся и удалённый автором текст.
+    if post.author != request.user:
+        return redirect('posts:post_detail', post_id)
+    template = 'posts/post_history.html'
+    context = {
+        'post': post,
+        'revisions': revision_history(post),
+    }
+    return render(request, template, context)
+
+
+@login_required
+@require_POST
+def post_delete(request, post_id):
+    post = get_object_or_404(
+        Post.all_objects.alive(), id=post_id, author=request.user
+    )
+    soft_delete_post(post)
+    return redirect('posts:profile', request.user.username)
+
+
+@login_required
+@ratelimit('add_comment')
 def add_comment(request, post_id):
     post = get_object_or_404(Post, id=post_id)
     form = CommentForm(request.POST or None)
@@ -128,10 +355,23 @@ def add_comment(request, post_id):
     return redirect('posts:post_detail', post_id=post_id)
 
 
+@login_required
+@require_POST
+def comment_delete(request, comment_id):
+    comment = get_object_or_404(
+        Comment.objects.select_related('post'), id=comment_id
+    )
+    if request.user.id not in (comment.author_id, comment.post.author_id):
+        raise PermissionDenied
+    soft_delete_comment(comment)
+    return redirect('posts:post_detail', comment.post_id)
+
+
 @login_required
 def follow_index(request):
     post_list = Post.objects.filter(author__following__user=request.user)
     page_obj = paginator(request, post_list)
+    reset_unread(request.user.id)
     template = 'posts/follow.html'
     content = {
         'page_obj': page_obj,
@@ -140,26 +380,32 @@ def follow_index(request):
 
 
 @login_required
+@ratelimit('follow', methods=('GET', 'POST'))
 def profile_follow(request, username):
     author_obj = get_object_or_404(User, username=username)
-    user_obj = request.user
-    follow_obj = Follow.objects.filter(
-        user=user_obj,
-        author=author_obj
-    )
-    if not follow_obj.exists() and author_obj != user_obj:
-        Follow.objects.create(user=user_obj, author=author_obj)
+    if author_obj != request.user:
+        Follow.objects.follow(request.user, author_obj)
     return redirect('posts:profile', username=author_obj.username)
 
 
 @login_required
+@ratelimit('follow', methods=('GET', 'POST'))
 def profile_unfollow(request, username):
     author_obj = get_object_or_404(User, username=username)
-    user_obj = request.user
-    follow_obj = Follow.objects.filter(
-        user=user_obj,
-        author=author_obj
-    )
-    if follow_obj.exists():
-        follow_obj.delete()
+    Follow.objects.unfollow(request.user, author_obj)
     return redirect('posts:profile', username=author_obj.username)
+
+
+@login_required
+@require_POST
+@ratelimit('follow')
+def follow_batch(request):
+    usernames = request.POST.getlist('authors')[:BATCH_FOLLOW_LIMIT]
+    authors = list(User.objects.filter(username__in=usernames))
+    if request.POST.get('action') == 'unfollow':
+        return JsonResponse({
+            'unfollowed': Follow.objects.unfollow_many(request.user, authors)
+        })
+    return JsonResponse({
+        'followed': Follow.objects.follow_many(request.user, authors)
+    })
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+
+USER_CACHE_KEY = 'auth_user:{}'
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, отдающий пользователя сессии из общего кеша.
+
+    AuthenticationMiddleware вызывает get_user на каждом запросе; после
+    первого обращения пользователь берётся из кеша по id из сессии.
+    Хеш сессии по-прежнему сверяется с паролем из кешированного объекта,
+    поэтому запись сбрасывается при любом сохранении пользователя:
+    смене пароля, редактировании профиля, обновлении last_login.
+    В нескольких процессах нужен общий кеш (memcached), иначе
+    сброс увидит только процесс, сохранивший пользователя.
+    """
+
+    def get_user(self, user_id):
+        key = USER_CACHE_KEY.format(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
@@ -0,0 +1,70 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class PasswordHashingBusy(Exception):
+    """Все места в пуле хеширования заняты дольше PASSWORD_HASH_WAIT."""
+
+
+class HashingPool:
+    """Ограниченный пул потоков для хеширования паролей.
+
+    hashlib.pbkdf2_hmac отпускает GIL, поэтому одновременно считается
+    не больше workers хешей, а ещё queue задач ждут своей очереди.
+    Остальные запросы ждут свободное место не дольше timeout секунд
+    и получают PasswordHashingBusy вместо того, чтобы копиться.
+    """
+
+    def __init__(self, workers, queue):
+        self.executor = ThreadPoolExecutor(
+            workers, thread_name_prefix='password-hash'
+        )
+        self.slots = threading.BoundedSemaphore(workers + queue)
+
+    def run(self, func, *args, timeout):
+        if not self.slots.acquire(timeout=timeout):
+            raise PasswordHashingBusy
+        try:
+            future = self.executor.submit(func, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future.result()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HashingPool(
+                settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE
+            )
+        return _pool
+
+
+class PooledPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 с числом итераций из PASSWORD_HASH_ITERATIONS,
+    вычисляемый в HashingPool.
+
+    Алгоритм совпадает со стандартным, так что существующие хеши
+    проверяются без миграции, а при смене числа итераций пароль
+    перехешируется при следующем входе.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
+
+    def encode(self, password, salt, iterations=None):
+        return get_pool().run(
+            super().encode, password, salt, iterations,
+            timeout=settings.PASSWORD_HASH_WAIT,
+        )
@@ -0,0 +1,58 @@
+import statistics
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет пропускную способность входа на сайт: параллельные '
+        'POST-запросы на users:login временного пользователя.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100)
+        parser.add_argument('--concurrency', type=int, default=16)
+
+    def handle(self, *args, **options):
+        username = f'bench-{uuid.uuid4().hex[:12]}'
+        password = uuid.uuid4().hex
+        user = get_user_model().objects.create_user(
+            username=username, password=password
+        )
+        try:
+            latencies, statuses, elapsed = self.run(
+                options, {'username': username, 'password': password}
+            )
+        finally:
+            user.delete()
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        self.stdout.write(
+            f'{len(latencies) / elapsed:8.1f} logins/s, '
+            f'median {statistics.median(latencies) * 1000:6.1f} ms, '
+            f'p95 {p95 * 1000:6.1f} ms, '
+            f'statuses {dict(statuses)}'
+        )
+
+    def run(self, options, credentials):
+        url = reverse('users:login')
+        statuses = Counter()
+
+        def login(_):
+            client = Client()
+            started = time.perf_counter()
+            response = client.post(url, credentials)
+            statuses[response.status_code] += 1
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            latencies = list(pool.map(login, range(options['requests'])))
+        return latencies, statuses, time.perf_counter() - started
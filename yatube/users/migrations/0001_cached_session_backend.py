@@ -0,0 +1,43 @@
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import migrations
+
+
+OLD_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+NEW_BACKEND = 'users.backends.CachedModelBackend'
+
+
+def switch_backend(apps, schema_editor, old=OLD_BACKEND, new=NEW_BACKEND):
+    """Переписывает бэкенд в сохранённых сессиях: get_user отвергает
+    бэкенды вне AUTHENTICATION_BACKENDS и иначе разлогинил бы всех.
+    """
+    Session = apps.get_model('sessions', 'Session')
+    store = SessionStore()
+    changed = []
+    sessions = Session.objects.filter(session_data__isnull=False)
+    for session in sessions.iterator(chunk_size=1000):
+        data = store.decode(session.session_data)
+        if data.get(BACKEND_SESSION_KEY) != old:
+            continue
+        data[BACKEND_SESSION_KEY] = new
+        session.session_data = store.encode(data)
+        changed.append(session)
+        if len(changed) >= 1000:
+            Session.objects.bulk_update(changed, ['session_data'])
+            changed = []
+    Session.objects.bulk_update(changed, ['session_data'])
+
+
+def restore_backend(apps, schema_editor):
+    switch_backend(apps, schema_editor, old=NEW_BACKEND, new=OLD_BACKEND)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sessions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(switch_backend, restore_backend),
+    ]
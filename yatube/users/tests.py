@@ -0,0 +1,128 @@
+import importlib
+import threading
+from unittest import mock
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from .hashers import HashingPool, PasswordHashingBusy
+
+
+User = get_user_model()
+
+
+class CachedUserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='MikeyMouse', password='OldPassword-123'
+        )
+        self.client = Client()
+        self.client.login(username='MikeyMouse', password='OldPassword-123')
+        self.url = reverse('about:author')
+
+    def test_user_and_session_from_cache(self):
+        """Повторный запрос не обращается к БД за сессией и
+        пользователем.
+        """
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_old_sessions_survive_backend_switch(self):
+        """Сессии, созданные с ModelBackend, после миграции остаются
+        активными.
+        """
+        migration = importlib.import_module(
+            'users.migrations.0001_cached_session_backend'
+        )
+        client = Client()
+        client.force_login(self.user, backend=migration.OLD_BACKEND)
+        # До переключения сессии хранились только в БД.
+        cache.clear()
+        migration.switch_backend(apps, None)
+        response = client.get(self.url)
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_profile_edit_resets_cache(self):
+        """Изменение пользователя видно на следующем запросе."""
+        self.client.get(self.url)
+        self.user.first_name = 'Mikey'
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['user'].first_name, 'Mikey')
+
+    def test_password_change_logs_out_other_sessions(self):
+        """После смены пароля другие сессии пользователя закрываются."""
+        other_client = Client()
+        other_client.login(username='MikeyMouse', password='OldPassword-123')
+        other_client.get(self.url)
+        self.client.post(reverse('users:password_change'), {
+            'old_password': 'OldPassword-123',
+            'new_password1': 'NewPassword-456',
+            'new_password2': 'NewPassword-456',
+        })
+        response = self.client.get(self.url)
+        self.assertTrue(response.context['user'].is_authenticated)
+        response = other_client.get(self.url)
+        self.assertFalse(response.context['user'].is_authenticated)
+
+
+@override_settings(
+    PASSWORD_HASHERS=['users.hashers.PooledPBKDF2PasswordHasher'],
+    PASSWORD_HASH_ITERATIONS=1000,
+)
+class PooledHasherTests(TestCase):
+    def test_hash_in_pool(self):
+        """Хеш считается в пуле с числом итераций из настроек."""
+        encoded = make_password('Password-123')
+        self.assertTrue(encoded.startswith('pbkdf2_sha256$1000$'))
+        self.assertTrue(check_password('Password-123', encoded))
+        self.assertFalse(check_password('wrong', encoded))
+
+    def test_rehash_on_iterations_change(self):
+        """После смены числа итераций пароль перехешируется."""
+        user = User.objects.create_user(
+            username='MikeyMouse', password='Password-123'
+        )
+        with self.settings(PASSWORD_HASH_ITERATIONS=2000):
+            self.assertTrue(user.check_password('Password-123'))
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$2000$'))
+
+    def test_pool_backpressure(self):
+        """Переполненный пул отклоняет задачу после ожидания."""
+        pool = HashingPool(workers=1, queue=0)
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        thread = threading.Thread(target=pool.run, args=(block,),
+                                  kwargs={'timeout': 1})
+        thread.start()
+        started.wait(5)
+        with self.assertRaises(PasswordHashingBusy):
+            pool.run(lambda: None, timeout=0.01)
+        release.set()
+        thread.join()
+        self.assertEqual(pool.run(lambda: 42, timeout=1), 42)
+
+    def test_login_busy_response(self):
+        """При переполненном пуле вход отвечает 503 с Retry-After."""
+        User.objects.create_user(username='MikeyMouse', password='Pass-123')
+        with mock.patch('users.hashers.get_pool') as get_pool:
+            get_pool.return_value.run.side_effect = PasswordHashingBusy
+            response = Client().post(
+                reverse('users:login'),
+                {'username': 'MikeyMouse', 'password': 'Pass-123'},
+            )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '2')
@@ -1,7 +1,7 @@
 from django.contrib.auth import views
 from django.urls import path
 
-from . views import SignUp
+from . views import SignUp, hashing_backpressure
 
 app_name = 'users'
 
@@ -14,12 +14,12 @@ urlpatterns = [
         name='logout'
     ),
     path('login/',
-         views.LoginView.as_view(
-             template_name='users/login.html'),
+         hashing_backpressure(views.LoginView.as_view(
+             template_name='users/login.html')),
          name='login'),
     path('password_change/',
-         views.PasswordChangeView.as_view(
-             template_name='users/password_change_form.html'),
+         hashing_backpressure(views.PasswordChangeView.as_view(
+             template_name='users/password_change_form.html')),
          name='password_change'),
     path('password_change/done/',
          views.PasswordChangeDoneView.as_view(
@@ -34,8 +34,8 @@ urlpatterns = [
              template_name='users/password_reset_done.html'),
          name='password_reset_done'),
     path('reset/<uidb64>/<token>/',
-         views.PasswordResetConfirmView.as_view(
-             template_name='users/password_reset_confirm.html'),
+         hashing_backpressure(views.PasswordResetConfirmView.as_view(
+             template_name='users/password_reset_confirm.html')),
          name='password_reset_confirm'),
     path('reset/done/',
          views.PasswordResetCompleteView.as_view(
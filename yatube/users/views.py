@@ -1,9 +1,34 @@
+import math
+from functools import wraps
+
+from django.conf import settings
+from django.shortcuts import render
+from django.utils.decorators import method_decorator
 from django.views.generic import CreateView
 from django.urls import reverse_lazy
 
 from .forms import CreationForm
+from .hashers import PasswordHashingBusy
+
+
+def hashing_backpressure(view):
+    """Отвечает 503, если пул хеширования паролей переполнен."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except PasswordHashingBusy:
+            retry_after = math.ceil(settings.PASSWORD_HASH_WAIT)
+            response = render(
+                request, 'core/503.html', {'retry_after': retry_after},
+                status=503,
+            )
+            response['Retry-After'] = retry_after
+            return response
+    return wrapper
 
 
+@method_decorator(hashing_backpressure, name='dispatch')
 class SignUp(CreateView):
     form_class = CreationForm
     success_url = reverse_lazy('posts:index')
@@ -0,0 +1,275 @@
+import os
+
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+SECRET_KEY = os.getenv(
+    'SECRET_KEY', 'qao7_!tt2e_s^5hy0@yc_!gsj$8aw#nk=lk2xy+&&pb3k&_o=&'
+)
+
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1',
+    '[::1]',
+    'testserver',
+]
+
+
+INTERNAL_IPS = [
+    '127.0.0.1',
+]
+
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'posts.apps.PostsConfig',
+    'users.apps.UsersConfig',
+    'core.apps.CoreConfig',
+    'sorl.thumbnail',
+]
+
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'core.middleware.static.StaticFilesMiddleware',
+    'core.middleware.replicas.ReplicaPinningMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.profiler.SamplingProfilerMiddleware',
+]
+
+
+ROOT_URLCONF = 'yatube.urls'
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'core.context_processors.year.year',
+                'core.context_processors.unread.unread',
+            ]
+        },
+    }
+]
+
+
+WSGI_APPLICATION = 'yatube.wsgi.application'
+
+
+def replica_databases(primary, field):
+    """Реплики из DB_REPLICAS: пути к файлам SQLite или хосты PostgreSQL."""
+    names = filter(None, os.getenv('DB_REPLICAS', '').split(','))
+    return {
+        f'replica_{number}': {
+            **primary,
+            field: name,
+            'TEST': {'MIRROR': 'default'},
+        }
+        for number, name in enumerate(names, 1)
+    }
+
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+    }
+}
+
+DATABASES.update(replica_databases(DATABASES['default'], 'NAME'))
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+
+REPLICA_PIN_COOKIE = 'use_primary'
+
+REPLICA_PIN_SECONDS = 5
+
+SQLITE_PRAGMAS = {}
+
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+PASSWORD_HASHERS = [
+    'users.hashers.PooledPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+PASSWORD_HASH_ITERATIONS = int(os.getenv('PASSWORD_HASH_ITERATIONS', 150000))
+
+PASSWORD_HASH_WORKERS = int(
+    os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1)
+)
+
+PASSWORD_HASH_QUEUE = 32
+
+PASSWORD_HASH_WAIT = 2
+
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+STATIC_URL = '/static/'
+
+STATICFILES_DIRS = [
+    os.path.join(BASE_DIR, 'static')
+]
+
+STATIC_ROOT = os.getenv(
+    'STATIC_ROOT', os.path.join(BASE_DIR, 'staticfiles')
+)
+
+STATIC_SERVE = False
+
+STATIC_MAX_AGE = 3600
+
+AUTHENTICATION_BACKENDS = ['users.backends.CachedModelBackend']
+
+USER_CACHE_TIMEOUT = 5 * 60
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+LOGIN_URL = 'users:login'
+
+LOGIN_REDIRECT_URL = 'posts:index'
+
+# LOGOUT_REDIRECT_URL = 'posts:index'
+
+EMAIL_BACKEND = 'core.mail.QueuedEmailBackend'
+
+EMAIL_QUEUE_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+EMAIL_QUEUE_MAX_ATTEMPTS = 8
+
+EMAIL_QUEUE_RETRY_DELAY = 30
+
+EMAIL_QUEUE_MAX_RETRY_DELAY = 60 * 60
+
+EMAIL_QUEUE_LEASE = 5 * 60
+
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
+SITE_URL = os.getenv('SITE_URL', 'http://localhost:8000')
+
+CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
+
+MEDIA_URL = '/media/'
+
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+MEDIA_SERVE = True
+
+MEDIA_MAX_AGE = 86400
+
+# None, 'x-sendfile' (Apache, lighttpd) или 'x-accel-redirect' (nginx)
+MEDIA_SENDFILE = os.getenv('MEDIA_SENDFILE')
+
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+RATELIMIT_CACHE = 'default'
+
+RATELIMITS = {
+    'post_create': '20/m',
+    'add_comment': '30/m',
+    'follow': '60/m',
+}
+
+# Общие лимиты на IP: за одним адресом бывает несколько пользователей.
+RATELIMITS_PER_IP = {
+    'post_create': '60/m',
+    'add_comment': '90/m',
+    'follow': '180/m',
+}
+
+PROFILER_ENABLED = bool(os.getenv('PROFILER_ENABLED'))
+
+PROFILER_SAMPLE_RATES = {
+    'posts:post_detail': 0.01,
+}
+
+PROFILER_HEADER = 'HTTP_X_PROFILE'
+
+PROFILER_FORMAT = 'collapsed'
+
+PROFILER_INTERVAL = 0.005
+
+PROFILER_OUTPUT_DIR = os.path.join(BASE_DIR, 'profiles')
+
+CONCURRENT_QUERIES = True
+
+QUERY_POOL_WORKERS = 8
+
+TRENDING_DECAY_SECONDS = 12 * 60 * 60
+
+TRENDING_COMMENT_WEIGHT = 1.0
+
+TRENDING_REACH_WEIGHT = 0.1
+
+# Поток SSE занимает поток воркера на EVENTS_MAX_DURATION: включать
+# только с асинхронными воркерами (gevent, eventlet)
+EVENTS_ENABLED = False
+
+# redis://... — общая шина событий SSE для нескольких процессов
+EVENTS_REDIS_URL = os.getenv('EVENTS_REDIS_URL')
+
+EVENTS_QUEUE_SIZE = 100
+
+EVENTS_KEEPALIVE = 15
+
+EVENTS_MAX_DURATION = 10 * 60
+
+# Каждая N-я редакция поста хранится целиком, остальные — дельтами
+POST_REVISION_SNAPSHOT_EVERY = 10
+
+# Редакции длиннее (старый и новый текст вместе) хранятся целиком
+POST_REVISION_DIFF_MAX_CHARS = 100_000
@@ -0,0 +1,86 @@
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, os, replica_databases
+
+DEBUG = False
+
+SECRET_KEY = os.environ['SECRET_KEY']
+
+ALLOWED_HOSTS = os.environ['ALLOWED_HOSTS'].split(',')
+
+CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', 600))
+
+if os.getenv('DB_ENGINE') == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'yatube'),
+            'USER': os.getenv('DB_USER', 'yatube'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': CONN_MAX_AGE,
+            'OPTIONS': {
+                'connect_timeout': 5,
+                'keepalives': 1,
+                'keepalives_idle': 60,
+                'application_name': 'yatube',
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv(
+                'DB_NAME', os.path.join(BASE_DIR, 'db.sqlite3')
+            ),
+            'CONN_MAX_AGE': CONN_MAX_AGE,
+            'OPTIONS': {
+                'timeout': 20,
+            },
+        }
+    }
+
+DATABASES.update(replica_databases(
+    DATABASES['default'],
+    'HOST' if os.getenv('DB_ENGINE') == 'postgresql' else 'NAME',
+))
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+if os.getenv('CACHE_LOCATION'):
+    CACHES = {
+        'default': {
+            'BACKEND': os.getenv(
+                'CACHE_BACKEND',
+                'django.core.cache.backends.memcached.PyLibMCCache',
+            ),
+            'LOCATION': os.getenv('CACHE_LOCATION').split(','),
+        }
+    }
+
+if os.getenv('EMAIL_HOST'):
+    EMAIL_QUEUE_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+    EMAIL_HOST = os.getenv('EMAIL_HOST')
+    EMAIL_PORT = int(os.getenv('EMAIL_PORT', 587))
+    EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
+    EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
+    EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', '1') == '1'
+    EMAIL_TIMEOUT = 10
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+STATIC_SERVE = True
+
+# Класс воркеров gunicorn (-k): SSE включаются только с асинхронными.
+WSGI_WORKER_CLASS = os.getenv('WSGI_WORKER_CLASS', 'sync')
+
+EVENTS_ENABLED = WSGI_WORKER_CLASS in ('gevent', 'eventlet')
@@ -0,0 +1,17 @@
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, DATABASES, os
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+# Отдельная SQLite-база реплики, без TEST MIRROR: тесты роутера видят,
+# что чтение действительно уходит в другую базу. Чтение с неё включают
+# только эти тесты через DATABASE_REPLICAS.
+DATABASES['replica_1'] = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': os.path.join(BASE_DIR, 'db_replica.sqlite3'),
+    'TEST': {'NAME': os.path.join(BASE_DIR, 'test_db_replica.sqlite3')},
+}
+
+DATABASE_REPLICAS = []
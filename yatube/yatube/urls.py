@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
-from django.conf.urls.static import static
+
+from core.views import serve_media
 
 
 handler403 = 'core.views.forbidden'
@@ -16,10 +17,16 @@ urlpatterns = [
     path('about/', include('about.urls', namespace='about')),
 ]
 
+if settings.MEDIA_SERVE:
+    urlpatterns += (
+        path(
+            settings.MEDIA_URL.lstrip('/') + '<path:path>',
+            serve_media,
+            name='media',
+        ),
+    )
+
 if settings.DEBUG:
     import debug_toolbar
 
-    urlpatterns += static(
-        settings.MEDIA_URL, document_root=settings.MEDIA_ROOT
-    )
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)